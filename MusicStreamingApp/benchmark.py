@@ -0,0 +1,537 @@
+"""
+Benchmarks for the MFun music library and playlists.
+
+Run from this directory:
+    python benchmark.py            # default sizes
+    python benchmark.py 10000      # custom sizes
+
+Hot-path suite, saved as JSON so runs can be compared for regressions:
+    python benchmark.py --suite 100000 --save before.json
+    python benchmark.py --suite 100000 --compare before.json
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+# The suite harness shared with the other app lives at the repository root;
+# appended so this directory's modules still come first
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+import benchmark_suite
+from benchmark_suite import time_runs
+
+import musicstreamingapp
+from musicstreamingapp import (ColumnarMusicLibrary, MusicLibrary, MusicStore, Playlist, PlaylistManager,
+                               Song, SQLiteMusicLibrary, ThreadSafeMusicLibrary, export_catalog, load_catalog)
+
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+PLAYLIST_SIZES = [1_000, 10_000, 50_000]
+
+
+def make_songs(count, seed=42):
+    rng = random.Random(seed)
+    artists = [f"Artist {i}" for i in range(max(1, count // 20))]
+    albums = [f"Album {i}" for i in range(max(1, count // 10))]
+    genres = ["Pop", "Rock", "Jazz", "Hip-Hop", "Classical", "Electronic", "Folk", "Metal"]
+
+    return [
+        Song(f"Song {i}", rng.choice(artists), rng.choice(albums), rng.choice(genres), rng.uniform(2, 6))
+        for i in range(count)
+    ]
+
+
+def time_per_call(func, args, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for arg in args:
+            func(arg)
+    return (time.perf_counter() - start) / (len(args) * repeat)
+
+
+def bench_lookups(size, queries=200):
+    songs = make_songs(size)
+    library = MusicLibrary()
+    for song in songs:
+        library.add_song(song)
+
+    rng = random.Random(7)
+    artists = [rng.choice(songs).artist for _ in range(queries)]
+
+    # The linear scan the library used before the secondary indexes
+    def scan(artist):
+        return [song for song in library.songs.values() if song.artist == artist]
+
+    scan_queries = artists[:max(1, queries // 100)] if size >= 1_000_000 else artists[:20]
+    scan_time = time_per_call(scan, scan_queries)
+    index_time = time_per_call(library.get_songs_by_artist, artists, repeat=10)
+
+    print(f"{size:>10,} songs | scan: {scan_time * 1e3:9.3f} ms | "
+          f"index: {index_time * 1e6:8.2f} us | speedup: {scan_time / index_time:8.0f}x")
+
+
+def bench_playlist(size):
+    songs = make_songs(size)
+    library = MusicLibrary()
+    for song in songs:
+        library.add_song(song)
+
+    # The list-backed playlist the app used before
+    start = time.perf_counter()
+    old_songs = []
+    for song in songs:
+        if song not in old_songs:
+            old_songs.append(song)
+    for song in songs[::2]:
+        if song in old_songs:
+            old_songs.remove(song)
+    list_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    playlist = Playlist("Benchmark", library)
+    for song in songs:
+        playlist.add_song(song)
+    for song in songs[::2]:
+        playlist.remove_song(song)
+    tree_time = time.perf_counter() - start
+
+    print(f"{size:>10,} songs | list: {list_time * 1e3:10.1f} ms | "
+          f"treap: {tree_time * 1e3:8.1f} ms")
+
+
+def bench_reorder(size, drags=100):
+    songs = make_songs(size)
+    library = MusicLibrary()
+    playlist = Playlist("Benchmark", library)
+    for song in songs:
+        library.add_song(song)
+        playlist.add_song(song)
+
+    rng = random.Random(3)
+    titles = [song.title for song in songs]
+    rng.shuffle(titles)
+
+    start = time.perf_counter()
+    playlist.reorder_songs(titles)
+    reorder_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(drags):
+        playlist.move(rng.choice(songs), rng.randrange(size))
+    move_time = (time.perf_counter() - start) / drags
+
+    print(f"{size:>10,} songs | full reorder: {reorder_time * 1e3:8.1f} ms | "
+          f"single move: {move_time * 1e3:6.3f} ms")
+
+
+class DictSong:
+    # Song as it was before __slots__ and interning, for the memory comparison
+    def __init__(self, title, artist, album, genre, length):
+        self.title = title
+        self.artist = artist
+        self.album = album
+        self.genre = genre
+        self.length = length
+
+
+def make_rows(count, seed=42):
+    # Fresh strings per row, the way values arrive from input() or a file
+    rng = random.Random(seed)
+    genres = ["Pop", "Rock", "Jazz", "Hip-Hop", "Classical", "Electronic", "Folk", "Metal"]
+    for i in range(count):
+        yield (f"Song {i}", f"Artist {rng.randrange(max(1, count // 20))}",
+               f"Album {rng.randrange(max(1, count // 10))}", "".join(rng.choice(genres)), rng.uniform(2, 6))
+
+
+def bytes_per_song(build, count):
+    tracemalloc.start()
+    library = build(count)
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del library
+    return used / count
+
+
+def build_library(library_class, song_class=Song):
+    def build(count):
+        library = library_class()
+        for row in make_rows(count):
+            library.add_song(song_class(*row))
+        return library
+    return build
+
+
+def bench_memory(size):
+    before = bytes_per_song(build_library(MusicLibrary, DictSong), size)
+    after = bytes_per_song(build_library(MusicLibrary), size)
+    columnar = bytes_per_song(build_library(ColumnarMusicLibrary), size)
+
+    print(f"{size:>10,} songs | __dict__ songs: {before:5.0f} B/song | "
+          f"__slots__ + interned: {after:5.0f} B/song | columnar: {columnar:5.0f} B/song")
+
+
+def bench_catalog_io(size):
+    songs = make_songs(size)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for extension in ('csv', 'jsonl'):
+            path = os.path.join(directory, f"catalog.{extension}")
+
+            start = time.perf_counter()
+            export_catalog(songs, path)
+            export_time = time.perf_counter() - start
+
+            library = MusicLibrary()
+            start = time.perf_counter()
+            load_catalog(library, path)
+            load_time = time.perf_counter() - start
+
+            print(f"{size:>10,} songs | {extension:>5} | export: {size / export_time:10,.0f} songs/s | "
+                  f"load: {size / load_time:10,.0f} songs/s ({load_time:.2f} s)")
+
+
+def bench_cold_start(size):
+    songs = make_songs(size)
+
+    with tempfile.TemporaryDirectory() as directory:
+        catalog_path = os.path.join(directory, "catalog.csv")
+        db_path = os.path.join(directory, "library.db")
+        export_catalog(songs, catalog_path)
+
+        store = MusicStore(db_path)
+        SQLiteMusicLibrary(store).add_songs(songs)
+        store.close()
+
+        # Rebuilding the in-memory library from a file
+        start = time.perf_counter()
+        library = MusicLibrary()
+        load_catalog(library, catalog_path)
+        library.get_songs_by_artist(songs[0].artist)
+        rebuild_time = time.perf_counter() - start
+
+        # Opening the store and answering the first query
+        start = time.perf_counter()
+        store = MusicStore(db_path)
+        SQLiteMusicLibrary(store).get_songs_by_artist(songs[0].artist)
+        open_time = time.perf_counter() - start
+        store.close()
+
+    print(f"{size:>10,} songs | rebuild in memory: {rebuild_time * 1e3:9.1f} ms | "
+          f"open store + first query: {open_time * 1e3:6.2f} ms")
+
+
+def bench_playlist_persistence(size):
+    # Saving a growing playlist after every added song: rewriting all of
+    # its rows each time vs. inserting only the new one
+    songs = make_songs(size)
+    timings = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for label in ('rewrite', 'per-song'):
+            store = MusicStore(os.path.join(directory, f"{label}.db"))
+            library = SQLiteMusicLibrary(store)
+            library.add_songs(songs)
+            playlist = Playlist("Bench", library)
+            store.save_playlist(playlist)
+
+            start = time.perf_counter()
+            for song in songs:
+                playlist.add_song(song)
+                if label == 'rewrite':
+                    store.save_playlist(playlist)
+                else:
+                    store.add_playlist_song(playlist.name, song.title)
+            timings[label] = time.perf_counter() - start
+            store.close()
+
+    print(f"{size:>10,} songs | rewrite playlist: {timings['rewrite']:7.2f} s | "
+          f"insert song row: {timings['per-song']:7.2f} s")
+
+
+def bench_playlist_registry(playlist_count, songs_per_playlist=50, queries=200):
+    songs = make_songs(5_000)
+    library = MusicLibrary()
+    library.add_songs(songs)
+    manager = PlaylistManager(library)
+
+    rng = random.Random(11)
+    for i in range(playlist_count):
+        playlist = manager.create(f"Playlist {i}")
+        for song in rng.sample(songs, songs_per_playlist):
+            playlist.add_song(song)
+    playlist_list = list(manager)
+
+    names = [f"Playlist {rng.randrange(playlist_count)}" for _ in range(queries)]
+    targets = rng.sample(songs, 20)
+
+    scan_name = time_per_call(lambda name: next((p for p in playlist_list if p.name == name), None), names)
+    index_name = time_per_call(manager.get, names, repeat=10)
+    scan_song = time_per_call(lambda song: [p for p in playlist_list if song in p], targets)
+    index_song = time_per_call(manager.playlists_containing, targets, repeat=10)
+
+    print(f"{playlist_count:>10,} playlists | by name: scan {scan_name * 1e6:9.1f} us, "
+          f"registry {index_name * 1e6:5.2f} us | containing song: scan {scan_song * 1e6:9.1f} us, "
+          f"reverse index {index_song * 1e6:5.2f} us")
+
+
+def make_words(count, rng):
+    # Pronounceable pseudo-words so titles look like text, not "Song 123"
+    consonants, vowels = "bcdfghjklmnprstvwz", "aeiou"
+    words = set()
+    while len(words) < count:
+        length = rng.randint(2, 4)
+        words.add("".join(rng.choice(consonants) + rng.choice(vowels) for _ in range(length)))
+    return sorted(words)
+
+
+def make_text_songs(count, seed=42):
+    rng = random.Random(seed)
+    words = make_words(20_000, rng)
+    artists = [" ".join(rng.sample(words, 2)).title() for _ in range(max(1, count // 20))]
+    albums = [" ".join(rng.sample(words, rng.randint(1, 3))).title() for _ in range(max(1, count // 10))]
+
+    titles = set()
+    songs = []
+    while len(songs) < count:
+        title = " ".join(rng.sample(words, rng.randint(2, 4))).title()
+        if title not in titles:
+            titles.add(title)
+            songs.append(Song(title, rng.choice(artists), rng.choice(albums), "Pop", rng.uniform(2, 6)))
+    return songs
+
+
+def typo(word, rng):
+    i = rng.randrange(len(word) - 1)
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def bench_search(size, queries=1_000):
+    songs = make_text_songs(size)
+    library = MusicLibrary()
+    library.add_songs(songs)
+
+    start = time.perf_counter()
+    library.search("warm up")
+    build_time = time.perf_counter() - start
+
+    rng = random.Random(5)
+    kinds = {
+        "exact": lambda song: song.title,
+        "prefix": lambda song: song.artist.split()[0][:3],
+        "typo": lambda song: typo(song.title.split()[0].lower(), rng),
+        "title+artist": lambda song: f"{song.title.split()[0]} {song.artist.split()[-1][:4]}",
+    }
+
+    print(f"{size:>10,} songs | index build: {build_time:6.2f} s")
+    for kind, make_query in kinds.items():
+        latencies = []
+        for song in rng.sample(songs, queries):
+            query = make_query(song)
+            start = time.perf_counter()
+            library.search(query)
+            latencies.append(time.perf_counter() - start)
+        latencies.sort()
+        p50 = latencies[len(latencies) // 2]
+        p99 = latencies[int(len(latencies) * 0.99) - 1]
+        print(f"{'':>16} {kind:>12}: p50 {p50 * 1e3:6.3f} ms | p99 {p99 * 1e3:6.3f} ms")
+
+
+def bench_concurrency(thread_count, size=50_000, duration=2.0):
+    # Stress test: readers search and look songs up while one writer keeps
+    # adding songs. Every result is checked, so a race shows up as an error.
+    songs = make_text_songs(size)
+    library = ThreadSafeMusicLibrary(MusicLibrary())
+    library.add_songs(songs[:size // 2])
+    library.search("warm up")
+
+    stop = threading.Event()
+    reads = [0] * thread_count
+    errors = []
+
+    def reader(slot):
+        rng = random.Random(slot)
+        while not stop.is_set():
+            song = rng.choice(songs)
+            try:
+                for found in library.get_songs_by_artist(song.artist):
+                    assert found.artist == song.artist
+                for found in library.search(song.title.split()[0]):
+                    assert library.get_songs_by_title(found.title) is not None
+            except Exception as e:
+                errors.append(e)
+                return
+            reads[slot] += 1
+
+    def writer():
+        for song in songs[size // 2:]:
+            if stop.is_set():
+                break
+            library.add_song(song)
+
+    threads = [threading.Thread(target=reader, args=(slot,)) for slot in range(thread_count)]
+    threads.append(threading.Thread(target=writer))
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    written = len(library) - size // 2
+    missing = sum(1 for song in songs[:size // 2 + written] if library.get_songs_by_title(song.title) is None)
+    status = "ok" if not errors and not missing else f"FAILED ({len(errors)} errors, {missing} missing)"
+    print(f"{thread_count:>10} readers | {sum(reads) / duration:10,.0f} reads/s | "
+          f"{written / duration:8,.0f} writes/s | {status}")
+
+
+def bench_aggregates(size):
+    songs = make_songs(size)
+    library = MusicLibrary()
+    library.add_songs(songs)
+    stats = library.statistics()
+    albums = [song.album for song in songs[:100]]
+
+    def rescan(album):
+        return sum(song.length for song in library.songs.values() if song.album == album)
+
+    scan_time = time_per_call(rescan, albums[:5])
+    stats_time = time_per_call(lambda album: stats.length_of('album', album), albums, repeat=10)
+
+    start = time.perf_counter()
+    stats.top('artist', n=10, by='length')
+    top_time = time.perf_counter() - start
+
+    columnar = ColumnarMusicLibrary()
+    columnar.add_songs(songs)
+    start = time.perf_counter()
+    columnar.group_by('genre', 'mean')
+    numpy_time = time.perf_counter() - start
+
+    numpy_module, musicstreamingapp.np = musicstreamingapp.np, None
+    start = time.perf_counter()
+    columnar.group_by('genre', 'mean')
+    python_time = time.perf_counter() - start
+    musicstreamingapp.np = numpy_module
+
+    print(f"{size:>10,} songs | album length: rescan {scan_time * 1e3:8.2f} ms, stats {stats_time * 1e6:5.2f} us | "
+          f"top-10 artists {top_time * 1e3:6.2f} ms | group_by genre: python {python_time * 1e3:7.1f} ms, "
+          f"numpy {numpy_time * 1e3:6.1f} ms")
+
+
+def write_catalog(path, count, seed=42):
+    # Catalog file (.csv or .jsonl) of `count` songs
+    export_catalog(make_songs(count, seed), path)
+
+
+def quietly(func, *args):
+    # reorder_songs reports to stdout; keep suite output readable
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        return func(*args)
+
+
+def run_suite(size, repeat=5, queries=1_000):
+    # Times the hot paths on a synthetic library of `size` songs; returns
+    # {case: [seconds per run]}
+    songs = make_songs(size)
+    library = MusicLibrary()
+    library.add_songs(songs)
+    rng = random.Random(7)
+    sample = [rng.choice(songs) for _ in range(queries)]
+    results = {}
+
+    for field in ('artist', 'album', 'genre'):
+        lookup = getattr(library, f"get_songs_by_{field}")
+        values = [getattr(song, field) for song in sample]
+        results[f"MusicLibrary.get_songs_by_{field}[{size}] x{queries}"] = time_runs(
+            lambda _: [lookup(value) for value in values], repeat=repeat)
+
+    playlist_size = min(size, 50_000)
+    playlist_songs = songs[:playlist_size]
+    results[f"Playlist.add_song[{playlist_size}]"] = time_runs(
+        lambda playlist: [playlist.add_song(song) for song in playlist_songs],
+        setup=lambda: Playlist("Suite", library), repeat=repeat)
+
+    def full_playlist():
+        playlist = Playlist("Suite", library)
+        for song in playlist_songs:
+            playlist.add_song(song)
+        return playlist
+
+    results[f"Playlist.remove_song[{playlist_size}] half"] = time_runs(
+        lambda playlist: [playlist.remove_song(song) for song in playlist_songs[::2]],
+        setup=full_playlist, repeat=repeat)
+
+    titles = [song.title for song in playlist_songs]
+    random.Random(3).shuffle(titles)
+    results[f"Playlist.reorder_songs[{playlist_size}]"] = time_runs(
+        lambda playlist: quietly(playlist.reorder_songs, titles), setup=full_playlist, repeat=repeat)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "catalog.csv")
+        write_catalog(path, size)
+        results[f"load_catalog[{size}] csv"] = time_runs(
+            lambda target: load_catalog(target, path), setup=MusicLibrary, repeat=max(1, repeat // 2))
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks for the MFun music library and playlists.")
+    parser.add_argument('sizes', nargs='*', type=int, help="library sizes to run instead of the defaults")
+    benchmark_suite.add_arguments(parser)
+    args = parser.parse_args()
+    benchmark_suite.run_requested(args, 'musicstreamingapp', run_suite, [100_000])
+    sizes = args.sizes
+
+    print("Lookup by artist (scan vs. secondary index):")
+    for size in sizes or DEFAULT_SIZES:
+        bench_lookups(size)
+
+    print("\nPlaylist build + remove half (list vs. treap-backed playlist):")
+    for size in sizes or PLAYLIST_SIZES:
+        bench_playlist(size)
+
+    print("\nReorder whole playlist vs. drag one song:")
+    for size in sizes or PLAYLIST_SIZES:
+        bench_reorder(size)
+
+    print("\nMemory per song:")
+    for size in sizes or DEFAULT_SIZES[:2]:
+        bench_memory(size)
+
+    print("\nBulk catalog import/export:")
+    for size in sizes or DEFAULT_SIZES:
+        bench_catalog_io(size)
+
+    print("\nCold start (time until the first artist lookup):")
+    for size in sizes or DEFAULT_SIZES:
+        bench_cold_start(size)
+
+    print("\nPersisting playlist edits (rewrite vs. one row per song):")
+    for size in [250, 1_000]:
+        bench_playlist_persistence(size)
+
+    print("\nPlaylist registry (linear scan vs. PlaylistManager):")
+    for count in [100, 1_000, 10_000]:
+        bench_playlist_registry(count)
+
+    print("\nSearch latency:")
+    for size in sizes or DEFAULT_SIZES:
+        bench_search(size)
+
+    print("\nAggregates (running stats and columnar group-by):")
+    for size in sizes or DEFAULT_SIZES:
+        bench_aggregates(size)
+
+    print("\nConcurrent readers + one writer (ThreadSafeMusicLibrary):")
+    for thread_count in [1, 2, 4, 8]:
+        bench_concurrency(thread_count)
+
+
+if __name__ == "__main__":
+    main()
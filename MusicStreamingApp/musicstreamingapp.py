@@ -18,74 +18,1357 @@ Data structures to consider:
        Tuples, Sets, Lists, Dictionaries, Trees, Graphs, Stacks, Queues
 """
 
+import csv
+import gc
+import json
+import heapq
+import os
+import random
+import re
+import sqlite3
+import sys
+import threading
+from array import array
+from bisect import bisect_left, insort
+from contextlib import contextmanager
+from itertools import islice
+
+try:
+    import numpy as np
+except ImportError:  # numpy only speeds up ColumnarMusicLibrary.group_by
+    np = None
 
 
 class Song:
+    # No per-instance __dict__; artist, album and genre repeat across many
+    # songs, so they are interned and every song shares one copy of each string
+    __slots__ = ('title', 'artist', 'album', 'genre', 'length')
+
     def __init__(self, title, artist, album, genre, length):
         self.title = title
-        self.artist = artist
-        self.album = album
-        self.genre = genre
+        self.artist = sys.intern(artist)
+        self.album = sys.intern(album)
+        self.genre = sys.intern(genre)
         self.length = length
 
+    # The library keys songs by title, so the title is a song's identity
+    def __eq__(self, other):
+        if not isinstance(other, Song):
+            return NotImplemented
+        return self.title == other.title
+
+    def __hash__(self):
+        return hash(self.title)
+
+    def __repr__(self):
+        return f"Song({self.title!r}, {self.artist!r}, {self.album!r}, {self.genre!r}, {self.length!r})"
+
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _words(text):
+    return _WORD_RE.findall(text.lower())
+
+
+def _trigrams(word):
+    padded = f"${word}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _edit_distance(a, b, limit):
+    # Levenshtein distance with adjacent transpositions, giving up (returning
+    # limit + 1) as soon as every cell in a row is over the limit
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        current = [i] + [0] * len(b)
+        for j, char_b in enumerate(b, start=1):
+            cost = char_a != char_b
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if previous2 is not None and i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class SongSearchIndex:
+    # Inverted index over the words of each song's title, artist and album.
+    # The vocabulary is kept in sorted lists bucketed by the first two
+    # letters, so prefix queries use bisect and inserting a new word only
+    # shifts one small bucket. A trigram index over the vocabulary finds near
+    # matches for typos. Songs are added and removed one at a time, so the
+    # index follows the library.
+    FIELD_WEIGHTS = (('title', 3), ('artist', 2), ('album', 1))
+    EXACT, PREFIX, FUZZY = 1.0, 0.6, 0.3
+
+    def __init__(self, max_candidates=2_000):
+        self.postings = {}
+        self.vocabulary = {}
+        self.words_by_trigram = {}
+        self.songs = {}
+        # Broad terms stop collecting after this many songs so a query like
+        # "a" can't turn into a scan of the whole library
+        self.max_candidates = max_candidates
+
+    def __len__(self):
+        return len(self.songs)
+
+    def _song_words(self, song):
+        weights = {}
+        for field, weight in self.FIELD_WEIGHTS:
+            for word in _words(getattr(song, field)):
+                if weights.get(word, 0) < weight:
+                    weights[word] = weight
+        return weights
+
+    def add(self, song):
+        if song.title in self.songs:
+            return
+        self.songs[song.title] = song
+
+        for word, weight in self._song_words(song).items():
+            bucket = self.postings.get(word)
+            if bucket is None:
+                bucket = self.postings[word] = {}
+                insort(self.vocabulary.setdefault(word[:2], []), word)
+                for trigram in _trigrams(word):
+                    self.words_by_trigram.setdefault(trigram, set()).add(word)
+            bucket[song.title] = weight
+
+    def remove(self, title):
+        song = self.songs.pop(title, None)
+        if song is None:
+            return
+
+        for word in self._song_words(song):
+            bucket = self.postings.get(word)
+            if bucket is None:
+                continue
+            bucket.pop(title, None)
+            if not bucket:
+                del self.postings[word]
+                words = self.vocabulary[word[:2]]
+                del words[bisect_left(words, word)]
+                if not words:
+                    del self.vocabulary[word[:2]]
+                for trigram in _trigrams(word):
+                    words = self.words_by_trigram[trigram]
+                    words.discard(word)
+                    if not words:
+                        del self.words_by_trigram[trigram]
+
+    def _prefix_words(self, term):
+        if len(term) < 2:
+            return [word for key, words in self.vocabulary.items() if key.startswith(term) for word in words]
+
+        words = self.vocabulary.get(term[:2], [])
+        start = bisect_left(words, term)
+        end = bisect_left(words, term + '\U0010ffff', start)
+        return words[start:end]
+
+    def _fuzzy_words(self, term, max_checks=50):
+        limit = 1 if len(term) <= 8 else 2
+        trigrams = _trigrams(term)
+        shared = {}
+        for trigram in trigrams:
+            for word in self.words_by_trigram.get(trigram, ()):
+                if abs(len(word) - len(term)) <= limit:
+                    shared[word] = shared.get(word, 0) + 1
+
+        # Only the words sharing the most trigrams get the (slow) edit
+        # distance check; a word within `limit` edits shares at least `needed`
+        needed = max(1, len(trigrams) - 4 * limit)
+        candidates = heapq.nlargest(max_checks, (item for item in shared.items() if item[1] >= needed),
+                                    key=lambda item: item[1])
+        return [word for word, _ in candidates if _edit_distance(term, word, limit) <= limit]
+
+    def _term_matches(self, term):
+        # (word, match quality) pairs for one query term; fuzzy matching only
+        # kicks in when nothing in the vocabulary starts with the term
+        matches = [(word, self.EXACT if word == term else self.PREFIX) for word in self._prefix_words(term)]
+        if not matches and len(term) >= 3:
+            matches = [(word, self.FUZZY) for word in self._fuzzy_words(term)]
+        return matches
+
+    def _collect(self, matches, limit=None):
+        scores = {}
+        for word, quality in matches:
+            for title, weight in self.postings[word].items():
+                score = quality * weight
+                if scores.get(title, 0) < score:
+                    scores[title] = score
+                if limit is not None and len(scores) >= limit:
+                    return scores
+        return scores
+
+    def search(self, query, page=1, page_size=10):
+        terms = _words(query)
+        if not terms or page < 1:
+            return []
+
+        term_matches = []
+        for term in terms:
+            matches = self._term_matches(term)
+            if not matches:
+                return []
+            size = sum(len(self.postings[word]) for word, _ in matches)
+            term_matches.append((size, matches))
+
+        # Start from the most selective term and narrow down with the rest
+        term_matches.sort(key=lambda item: item[0])
+        scores = self._collect(term_matches[0][1], self.max_candidates)
+
+        for size, matches in term_matches[1:]:
+            if not scores:
+                break
+            if size <= len(scores) * len(matches):
+                term_scores = self._collect(matches)
+            else:
+                term_scores = {}
+                for title in scores:
+                    best = max((quality * self.postings[word].get(title, 0) for word, quality in matches), default=0)
+                    if best:
+                        term_scores[title] = best
+            scores = {title: score + term_scores[title] for title, score in scores.items() if title in term_scores}
+
+        wanted = page * page_size
+        ranked = heapq.nsmallest(wanted, scores.items(), key=lambda item: (-item[1], item[0]))
+        return [self.songs[title] for title, _ in ranked[wanted - page_size:]]
+
+
+class LibraryStats:
+    # Running totals per artist, album and genre. add/remove update them in
+    # O(1), so counts and durations never need a pass over the library.
+    FIELDS = ('artist', 'album', 'genre')
+
+    def __init__(self):
+        self.count = 0
+        self.total_length = 0.0
+        # field -> {value: [song count, total length]}
+        self.groups = {field: {} for field in self.FIELDS}
+
+    def add(self, song):
+        self.count += 1
+        self.total_length += song.length
+        for field in self.FIELDS:
+            totals = self.groups[field].setdefault(getattr(song, field), [0, 0.0])
+            totals[0] += 1
+            totals[1] += song.length
+
+    def remove(self, song):
+        self.count -= 1
+        self.total_length = self.total_length - song.length if self.count else 0.0
+        for field in self.FIELDS:
+            groups = self.groups[field]
+            value = getattr(song, field)
+            totals = groups[value]
+            totals[0] -= 1
+            totals[1] -= song.length
+            if not totals[0]:
+                del groups[value]
+
+    def song_count(self, field, value):
+        totals = self.groups[field].get(value)
+        return totals[0] if totals else 0
+
+    def length_of(self, field, value):
+        totals = self.groups[field].get(value)
+        return totals[1] if totals else 0.0
+
+    def counts(self, field):
+        return {value: totals[0] for value, totals in self.groups[field].items()}
+
+    def lengths(self, field):
+        return {value: totals[1] for value, totals in self.groups[field].items()}
+
+    def top(self, field, n=10, by='count'):
+        # [(value, count or length)] for the n largest groups, O(k log n)
+        position = 0 if by == 'count' else 1
+        largest = heapq.nlargest(n, self.groups[field].items(), key=lambda item: item[1][position])
+        return [(value, totals[position]) for value, totals in largest]
+
 
 class MusicLibrary:
     def __init__(self):
         self.songs = {}
 
+        # Secondary indexes: value -> {title: song}. The inner dicts keep
+        # insertion order and make removal O(1).
+        self.artist_index = {}
+        self.album_index = {}
+        self.genre_index = {}
+
+        # Built on the first search/statistics() call, then kept up to date
+        # by add/remove
+        self.search_index = None
+        self.stats = None
+
     def add_song(self, song):
-        if song.title not in self.songs:
-            self.songs[song.title] = song
+        if song.title in self.songs:
+            return False
+
+        self.songs[song.title] = song
+        self.artist_index.setdefault(song.artist, {})[song.title] = song
+        self.album_index.setdefault(song.album, {})[song.title] = song
+        self.genre_index.setdefault(song.genre, {})[song.title] = song
+        if self.search_index is not None:
+            self.search_index.add(song)
+        if self.stats is not None:
+            self.stats.add(song)
+        return True
+
+    def __len__(self):
+        return len(self.songs)
+
+    def __iter__(self):
+        return iter(self.songs.values())
+
+    def add_songs(self, songs):
+        # Bulk version of add_song: one pass that fills the title map and all
+        # three indexes, with lookups hoisted out of the loop
+        library_songs = self.songs
+        artist_index = self.artist_index
+        album_index = self.album_index
+        genre_index = self.genre_index
+        added = 0
+
+        for song in songs:
+            title = song.title
+            if title in library_songs:
+                continue
+            library_songs[title] = song
+            artist_index.setdefault(song.artist, {})[title] = song
+            album_index.setdefault(song.album, {})[title] = song
+            genre_index.setdefault(song.genre, {})[title] = song
+            if self.search_index is not None:
+                self.search_index.add(song)
+            if self.stats is not None:
+                self.stats.add(song)
+            added += 1
+
+        return added
+
+    def remove_song(self, title):
+        song = self.songs.pop(title, None)
+        if song is None:
+            return None
+
+        self._unindex(self.artist_index, song.artist, title)
+        self._unindex(self.album_index, song.album, title)
+        self._unindex(self.genre_index, song.genre, title)
+        if self.search_index is not None:
+            self.search_index.remove(title)
+        if self.stats is not None:
+            self.stats.remove(song)
+        return song
+
+    def _unindex(self, index, key, title):
+        bucket = index.get(key)
+        if bucket is not None:
+            bucket.pop(title, None)
+            # Drop empty buckets so the index doesn't grow with deleted values
+            if not bucket:
+                del index[key]
 
     def get_songs_by_artist(self, artist):
-        return [song for song in self.songs.values() if song.artist == artist]
+        return list(self.artist_index.get(artist, {}).values())
 
     def get_songs_by_album(self, album):
-        return [song for song in self.songs.values() if song.album == album]
+        return list(self.album_index.get(album, {}).values())
 
     def get_songs_by_genre(self, genre):
-        return [song for song in self.songs.values() if song.genre == genre]
+        return list(self.genre_index.get(genre, {}).values())
 
     def get_songs_by_title(self, title):
         return self.songs.get(title, None)
 
+    def search(self, query, page=1, page_size=10):
+        # Prefix and typo-tolerant search over title, artist and album
+        if self.search_index is None:
+            self.search_index = SongSearchIndex()
+            for song in self.songs.values():
+                self.search_index.add(song)
+        return self.search_index.search(query, page, page_size)
+
+    def statistics(self):
+        if self.stats is None:
+            self.stats = LibraryStats()
+            for song in self.songs.values():
+                self.stats.add(song)
+        return self.stats
+
+
+class _CategoryColumn:
+    # Dictionary-encoded column: each distinct value is stored once and rows
+    # hold a 4-byte code. rows_by_code gives O(matches) lookups.
+    def __init__(self):
+        self.values = []
+        self.codes_by_value = {}
+        self.codes = array('I')
+        self.rows_by_code = []
+
+    def append(self, value, row):
+        code = self.codes_by_value.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self.codes_by_value[value] = code
+            self.rows_by_code.append(array('I'))
+
+        self.codes.append(code)
+        self.rows_by_code[code].append(row)
+
+    def value_at(self, row):
+        return self.values[self.codes[row]]
+
+    def rows_for(self, value):
+        code = self.codes_by_value.get(value)
+        return self.rows_by_code[code] if code is not None else ()
+
+
+class ColumnarMusicLibrary:
+    # Array-backed alternative to MusicLibrary with the same API. Songs are
+    # stored column by column and Song objects are only built on lookup,
+    # which keeps very large catalogs compact and easy to scan in bulk.
+    def __init__(self):
+        self.titles = []
+        self.rows_by_title = {}
+        self.artists = _CategoryColumn()
+        self.albums = _CategoryColumn()
+        self.genres = _CategoryColumn()
+        self.lengths = array('d')
+        # 1 for live rows, 0 for removed ones
+        self.live = bytearray()
+
+    def __len__(self):
+        return len(self.rows_by_title)
+
+    def __iter__(self):
+        for row, title in enumerate(self.titles):
+            if title is not None:
+                yield self._song_at(row)
+
+    def add_songs(self, songs):
+        added = 0
+        for song in songs:
+            added += self.add_song(song)
+        return added
+
+    def add_song(self, song):
+        if song.title in self.rows_by_title:
+            return False
+
+        row = len(self.titles)
+        self.titles.append(song.title)
+        self.rows_by_title[song.title] = row
+        self.artists.append(song.artist, row)
+        self.albums.append(song.album, row)
+        self.genres.append(song.genre, row)
+        self.lengths.append(song.length)
+        self.live.append(1)
+        return True
+
+    def remove_song(self, title):
+        row = self.rows_by_title.pop(title, None)
+        if row is None:
+            return None
+
+        # Leave a tombstone; lookups skip rows whose title is None
+        song = self._song_at(row, title)
+        self.titles[row] = None
+        self.live[row] = 0
+        return song
+
+    def _song_at(self, row, title=None):
+        return Song(title or self.titles[row], self.artists.value_at(row), self.albums.value_at(row),
+                    self.genres.value_at(row), self.lengths[row])
+
+    def _songs_at(self, rows):
+        return [self._song_at(row) for row in rows if self.titles[row] is not None]
+
+    def get_songs_by_artist(self, artist):
+        return self._songs_at(self.artists.rows_for(artist))
+
+    def get_songs_by_album(self, album):
+        return self._songs_at(self.albums.rows_for(album))
+
+    def get_songs_by_genre(self, genre):
+        return self._songs_at(self.genres.rows_for(genre))
+
+    def get_songs_by_title(self, title):
+        row = self.rows_by_title.get(title)
+        return self._song_at(row) if row is not None else None
+
+    def group_by(self, field, aggregate='count'):
+        # Ad-hoc {artist/album/genre value: count, sum or mean of length},
+        # computed over whole columns at once with numpy when it is installed
+        if aggregate not in ('count', 'sum', 'mean'):
+            raise ValueError(f"Unknown aggregate '{aggregate}'. Use 'count', 'sum' or 'mean'.")
+
+        column = {'artist': self.artists, 'album': self.albums, 'genre': self.genres}[field]
+        groups = len(column.values)
+
+        if np is not None:
+            codes = np.frombuffer(column.codes, dtype=np.uint32)
+            live = np.frombuffer(self.live, dtype=np.uint8).astype(np.float64)
+            counts = np.bincount(codes, weights=live, minlength=groups)
+            sums = np.bincount(codes, weights=np.frombuffer(self.lengths, dtype=np.float64) * live, minlength=groups)
+            counts, sums = counts.tolist(), sums.tolist()
+        else:
+            counts, sums = [0] * groups, [0.0] * groups
+            for code, length, alive in zip(column.codes, self.lengths, self.live):
+                if alive:
+                    counts[code] += 1
+                    sums[code] += length
+
+        result = {}
+        for code, value in enumerate(column.values):
+            if counts[code]:
+                if aggregate == 'count':
+                    result[value] = int(counts[code])
+                elif aggregate == 'sum':
+                    result[value] = sums[code]
+                else:
+                    result[value] = sums[code] / counts[code]
+        return result
+
+
+class _PlaylistNode:
+    # Node of an implicit treap: ordered by position, not by a key, with
+    # each node's subtree size so positions can be counted in O(log n)
+    __slots__ = ('song', 'priority', 'left', 'right', 'parent', 'size')
+
+    def __init__(self, song):
+        self.song = song
+        self.priority = random.random()
+        self.reset()
+
+    def reset(self):
+        self.left = self.right = self.parent = None
+        self.size = 1
+
+
+def _size(node):
+    return node.size if node is not None else 0
+
+
+def _update(node):
+    node.size = 1 + _size(node.left) + _size(node.right)
+    if node.left is not None:
+        node.left.parent = node
+    if node.right is not None:
+        node.right.parent = node
+
+
+def _merge(left, right):
+    # One tree holding every node of `left` followed by every node of `right`
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        _update(left)
+        return left
+    right.left = _merge(left, right.left)
+    _update(right)
+    return right
+
+
+def _split(node, count):
+    # (tree of the first `count` nodes, tree of the rest)
+    if node is None:
+        return None, None
+    if _size(node.left) >= count:
+        left, node.left = _split(node.left, count)
+        _update(node)
+        return left, node
+    node.right, right = _split(node.right, count - _size(node.left) - 1)
+    _update(node)
+    return node, right
+
 
 class Playlist:
     def __init__(self, name, music_library):
         self.name = name
-        self.songs = []
         self.library = music_library
 
+        # Songs live in an implicit treap (a balanced tree in display order)
+        # and a dict maps each song to its node. Membership is O(1); add,
+        # remove, moves next to another song and moves to a position are
+        # O(log n) expected.
+        self._root = None
+        self._nodes = {}
+
+        # Set by PlaylistManager so it can keep its song -> playlists index current
+        self.manager = None
+
+        # Kept up to date by add_song/remove_song
+        self.total_length = 0.0
+
+    @property
+    def songs(self):
+        return list(self)
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __iter__(self):
+        # In-order walk with an explicit stack
+        stack = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.song
+            node = node.right
+
+    def __contains__(self, song):
+        return song in self._nodes
+
+    def _set_root(self, root):
+        self._root = root
+        if root is not None:
+            root.parent = None
+
+    def _index_of(self, node):
+        # Position of `node`, counted on the way up to the root
+        index = _size(node.left)
+        while node.parent is not None:
+            if node is node.parent.right:
+                index += _size(node.parent.left) + 1
+            node = node.parent
+        return index
+
+    def _insert(self, node, index):
+        node.reset()
+        left, right = _split(self._root, index)
+        self._set_root(_merge(_merge(left, node), right))
+
+    def _append(self, node):
+        # Insert at the end without a split: walk down the right spine past
+        # the higher priorities; what's left below becomes node's left subtree
+        node.reset()
+        parent, child = None, self._root
+        while child is not None and child.priority > node.priority:
+            child.size += 1
+            parent, child = child, child.right
+        node.left = child
+        if child is not None:
+            child.parent = node
+            node.size += child.size
+        node.parent = parent
+        if parent is None:
+            self._root = node
+        else:
+            parent.right = node
+
+    def _detach(self, node):
+        # Replace node by the merge of its children, then shrink its ancestors
+        child = _merge(node.left, node.right)
+        parent = node.parent
+        if child is not None:
+            child.parent = parent
+        if parent is None:
+            self._root = child
+            return
+        if parent.left is node:
+            parent.left = child
+        else:
+            parent.right = child
+        while parent is not None:
+            parent.size -= 1
+            parent = parent.parent
+
     def add_song(self, song):
-        if song not in self.songs:
-            self.songs.append(song)
+        if song in self._nodes:
+            return False
+
+        node = _PlaylistNode(song)
+        self._nodes[song] = node
+        self._append(node)
+        self.total_length += song.length
+        if self.manager is not None:
+            self.manager._song_added(self, song)
+        return True
 
     def remove_song(self, song):
-        if song in self.songs:
-            self.songs.remove(song)
-            print("Song removed from the playlist.")
+        node = self._nodes.pop(song, None)
+        if node is not None:
+            self._detach(node)
+            self.total_length = self.total_length - song.length if self._nodes else 0.0
+            if self.manager is not None:
+                self.manager._song_removed(self, song)
+            return True
+        return False
+
+    def move_before(self, song, anchor_song):
+        node = self._nodes.get(song)
+        anchor = self._nodes.get(anchor_song)
+        if node is None or anchor is None:
+            return False
+
+        if node is not anchor:
+            self._detach(node)
+            self._insert(node, self._index_of(anchor))
+        return True
+
+    def move_after(self, song, anchor_song):
+        node = self._nodes.get(song)
+        anchor = self._nodes.get(anchor_song)
+        if node is None or anchor is None:
+            return False
+
+        if node is not anchor:
+            self._detach(node)
+            self._insert(node, self._index_of(anchor) + 1)
+        return True
+
+    def move_to_end(self, song):
+        node = self._nodes.get(song)
+        if node is None:
+            return False
+
+        self._detach(node)
+        self._append(node)
+        return True
+
+    def _node_at(self, index):
+        size = len(self._nodes)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("playlist index out of range")
+
+        node = self._root
+        while True:
+            left = _size(node.left)
+            if index < left:
+                node = node.left
+            elif index == left:
+                return node
+            else:
+                index -= left + 1
+                node = node.right
+
+    def move(self, song, index):
+        node = self._nodes.get(song)
+        if node is None:
+            return False
+
+        if index < 0:
+            index += len(self._nodes)
+        if not 0 <= index < len(self._nodes):
+            raise IndexError("playlist index out of range")
+
+        # With the song taken out, the song now at `index` is the one it goes before
+        self._detach(node)
+        self._insert(node, index)
+        return True
+
+    def swap(self, i, j):
+        first = self._node_at(i)
+        second = self._node_at(j)
+
+        first.song, second.song = second.song, first.song
+        self._nodes[first.song] = first
+        self._nodes[second.song] = second
 
     def reorder_songs(self, new_order):
-        new_songs = [self.library.get_songs_by_title(title) for title in new_order if self.library.get_songs_by_title(title)]
+        # Resolve each title once
+        new_songs = [self.library.get_songs_by_title(title) for title in new_order]
+
+        # The new order must be a permutation of the songs already in the playlist
+        is_permutation = (
+            len(new_songs) == len(self._nodes)
+            and None not in new_songs
+            and len(set(new_songs)) == len(new_songs)
+            and all(song in self._nodes for song in new_songs)
+        )
 
-        # Check if the new order contains all the songs in the playlist
-        if len(new_songs) == len(self.songs) and all(new_songs):
-            self.songs = new_songs
+        if is_permutation:
+            # Rebuild the tree from the existing nodes in the new order
+            self._root = None
+            for song in new_songs:
+                self._append(self._nodes[song])
             print("Playlist reordered.")
         else:
-            print("Invalid new order. Please ensure all song titles are correct and exist in the library. The playlist remains unchanged.")
+            print("Invalid new order. Please ensure all song titles are correct, exist in the playlist and appear exactly once. The playlist remains unchanged.")
 
 
 
     def display_playlist(self):
         print(f"\nPlaylist: {self.name}")
-        for i, song in enumerate(self.songs, start=1):
+        for i, song in enumerate(self, start=1):
             print(f"{i}. {song.title} - {song.artist} ({song.length:.2f} mns)")
+        print(f"Total: {len(self)} songs, {self.total_length:.2f} mns")
+
+
+class PlaylistManager:
+    # Registry of playlists keyed by their unique name, plus a reverse index
+    # from each song to the playlists that contain it. With a MusicStore,
+    # saved playlists are only listed at startup and each one is loaded on
+    # first use.
+    def __init__(self, music_library, store=None):
+        self.library = music_library
+        self.store = store
+        # name -> Playlist, or None for a saved playlist not loaded yet
+        self.playlists = dict.fromkeys(store.playlist_names()) if store else {}
+        self.playlists_by_song = {}
+
+    def __len__(self):
+        return len(self.playlists)
+
+    def __iter__(self):
+        for name in [name for name, playlist in self.playlists.items() if playlist is None]:
+            self._load(name)
+        return iter(self.playlists.values())
+
+    def is_loaded(self, name):
+        return self.playlists.get(name) is not None or name not in self.playlists
+
+    def _load(self, name):
+        playlist = self.store.load_playlist(name, self.library)
+        self.playlists[name] = playlist
+        playlist.manager = self
+        for song in playlist:
+            self._song_added(playlist, song)
+        return playlist
+
+    def __contains__(self, name):
+        return name in self.playlists
+
+    def create(self, name):
+        if name in self.playlists:
+            return None
+        return self.register(Playlist(name, self.library))
+
+    def register(self, playlist):
+        # Adopt an existing playlist, e.g. one loaded from a MusicStore
+        if playlist.name in self.playlists:
+            return None
+
+        self.playlists[playlist.name] = playlist
+        playlist.manager = self
+        for song in playlist:
+            self._song_added(playlist, song)
+        return playlist
+
+    def get(self, name):
+        if not self.is_loaded(name):
+            return self._load(name)
+        return self.playlists.get(name)
+
+    def delete(self, name):
+        if not self.is_loaded(name):
+            self._load(name)
+        playlist = self.playlists.pop(name, None)
+        if playlist is not None:
+            for song in playlist:
+                self._song_removed(playlist, song)
+            playlist.manager = None
+        return playlist
+
+    def _song_added(self, playlist, song):
+        self.playlists_by_song.setdefault(song, {})[playlist.name] = playlist
+
+    def _song_removed(self, playlist, song):
+        containing = self.playlists_by_song.get(song)
+        if containing is not None:
+            containing.pop(playlist.name, None)
+            if not containing:
+                del self.playlists_by_song[song]
+
+    def playlists_containing(self, song):
+        # The reverse index only covers loaded playlists; the store knows
+        # which of the others hold the song
+        if self.store is not None:
+            for name in self.store.playlists_with(song.title):
+                if not self.is_loaded(name):
+                    self._load(name)
+        return list(self.playlists_by_song.get(song, {}).values())
+
+    def remove_song_everywhere(self, song):
+        # Returns the playlists the song was removed from
+        affected = self.playlists_containing(song)
+        for playlist in affected:
+            playlist.remove_song(song)
+        return affected
+
+    def add_song_to_playlists(self, song, names):
+        # Returns the playlists the song was newly added to
+        added = []
+        for name in names:
+            playlist = self.get(name)
+            if playlist is not None and playlist.add_song(song):
+                added.append(playlist)
+        return added
+
+
+class ReadWriteLock:
+    # Any number of readers or a single writer. Waiting writers block new
+    # readers so a steady stream of searches can't starve them.
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self):
+        with self._condition:
+            while self._writer or self._writers_waiting:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self._condition:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writer = False
+                self._condition.notify_all()
+
+
+class _Synchronized:
+    # Proxy that runs the wrapped object's methods under a ReadWriteLock:
+    # names in READS take the shared read lock, everything else the write
+    # lock. Plain values such as names and counts are read under the read
+    # lock. Containers and other objects are refused: they would either
+    # change under the caller or cost a copy of the whole library, so
+    # callers go through the locked methods instead.
+    READS = frozenset()
+    VALUE_TYPES = (str, int, float, bool, type(None))
+
+    def __init__(self, target, lock=None):
+        self._target = target
+        self._lock = lock or ReadWriteLock()
+
+    def __getattr__(self, name):
+        with self._lock.read():
+            attribute = getattr(self._target, name)
+        if not callable(attribute):
+            if isinstance(attribute, self.VALUE_TYPES):
+                return attribute
+            raise AttributeError(f"'{name}' can't be shared outside the lock; use {type(self).__name__}'s methods")
+
+        guard = self._lock.read if name in self.READS else self._lock.write
+
+        def locked(*args, **kwargs):
+            with guard():
+                return attribute(*args, **kwargs)
+        return locked
+
+    def __len__(self):
+        with self._lock.read():
+            return len(self._target)
+
+    def __iter__(self):
+        # Iterate over a snapshot so writers aren't blocked for the whole loop
+        with self._lock.read():
+            return iter(list(self._target))
+
+    def __contains__(self, item):
+        with self._lock.read():
+            return item in self._target
+
+
+class ThreadSafeMusicLibrary(_Synchronized):
+    READS = frozenset({'get_songs_by_artist', 'get_songs_by_album', 'get_songs_by_genre', 'get_songs_by_title'})
+
+    def search(self, query, page=1, page_size=10):
+        with self._lock.read():
+            if self._target.search_index is not None:
+                return self._target.search(query, page, page_size)
+        # The first search builds the index, which is a write
+        with self._lock.write():
+            return self._target.search(query, page, page_size)
+
+
+    def statistics(self):
+        # May build the stats on first use, so take the write lock
+        with self._lock.write():
+            return _ThreadSafeStats(self._target.statistics(), self._lock)
+
+
+class _ThreadSafeStats(_Synchronized):
+    READS = frozenset({'song_count', 'length_of', 'counts', 'lengths', 'top'})
+
+
+class ThreadSafePlaylist(_Synchronized):
+    READS = frozenset({'display_playlist'})
+
+
+class ThreadSafePlaylistManager(_Synchronized):
+    # Playlists handed out share the manager's lock, because changing any of
+    # them also updates the manager's song -> playlists index
+    def _wrap(self, playlist):
+        return ThreadSafePlaylist(playlist, self._lock) if playlist is not None else None
+
+    def _loading(self):
+        # Playlists saved in a store are loaded on first use, which is a write
+        return self._lock.write() if self._target.store is not None else self._lock.read()
+
+    def __iter__(self):
+        with self._loading():
+            return iter([self._wrap(playlist) for playlist in self._target])
+
+    def get(self, name):
+        with self._lock.read():
+            if self._target.is_loaded(name):
+                return self._wrap(self._target.get(name))
+        with self._lock.write():
+            return self._wrap(self._target.get(name))
+
+    def create(self, name):
+        with self._lock.write():
+            return self._wrap(self._target.create(name))
+
+    def register(self, playlist):
+        with self._lock.write():
+            return self._wrap(self._target.register(playlist))
+
+    def delete(self, name):
+        with self._lock.write():
+            return self._target.delete(name)
+
+    def playlists_containing(self, song):
+        with self._loading():
+            return [self._wrap(playlist) for playlist in self._target.playlists_containing(song)]
+
+    def remove_song_everywhere(self, song):
+        with self._lock.write():
+            return [self._wrap(playlist) for playlist in self._target.remove_song_everywhere(song)]
 
+    def add_song_to_playlists(self, song, names):
+        with self._lock.write():
+            return [self._wrap(playlist) for playlist in self._target.add_song_to_playlists(song, names)]
 
-def main():
-    library = MusicLibrary()
-    playlists = []
+
+CATALOG_FIELDS = ['title', 'artist', 'album', 'genre', 'length']
+
+
+def parse_length(text):
+    # "3:30" -> 3.5 minutes; a plain number is taken as minutes already
+    text = text.strip()
+    if ':' in text:
+        minutes, seconds = map(int, text.split(':'))
+        return float(minutes) + float(seconds) / 60
+    return float(text)
+
+
+def _catalog_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        return 'csv'
+    if extension in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    raise ValueError(f"Unsupported catalog format '{extension}'. Use .csv, .jsonl or .ndjson.")
+
+
+def _catalog_rows(file, file_format):
+    # (line number, [title, artist, album, genre, length]) with the text
+    # fields as str; a malformed line raises ValueError naming the line
+    if file_format == 'csv':
+        reader = csv.reader(file)
+        header = [name.strip().lower() for name in next(reader, [])]
+        missing = [field for field in CATALOG_FIELDS if field not in header]
+        if missing:
+            raise ValueError(f"Catalog header has no {', '.join(missing)} column")
+        positions = [header.index(field) for field in CATALOG_FIELDS]
+        width = max(positions) + 1
+        for row in reader:
+            if row:
+                if len(row) < width:
+                    raise ValueError(f"Line {reader.line_num}: expected {width} fields, found {len(row)}")
+                yield reader.line_num, [row[i] for i in positions]
+    else:
+        for line_number, line in enumerate(file, start=1):
+            if line.strip():
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    raise ValueError(f"Line {line_number}: {e}") from None
+                try:
+                    title, artist, album, genre, length = (record[field] for field in CATALOG_FIELDS)
+                except KeyError as e:
+                    raise ValueError(f"Line {line_number}: missing {e}") from None
+                except TypeError:
+                    raise ValueError(f"Line {line_number}: expected a JSON object") from None
+                yield line_number, [str(title), str(artist), str(album), str(genre), length]
+
+
+def _catalog_song(line_number, fields):
+    title, artist, album, genre, length = fields
+    try:
+        length = length if isinstance(length, float) else parse_length(str(length))
+    except ValueError:
+        raise ValueError(f"Line {line_number}: invalid length {length!r}") from None
+    return Song(title, artist, album, genre, length)
+
+
+def read_catalog(path, chunk_size=10_000):
+    # Stream a CSV or JSON-lines catalog as lists of at most chunk_size songs;
+    # only one chunk is held in memory at a time
+    file_format = _catalog_format(path)
+    with open(path, newline='', encoding='utf-8') as file:
+        rows = _catalog_rows(file, file_format)
+        while True:
+            chunk = [_catalog_song(line_number, fields) for line_number, fields in islice(rows, chunk_size)]
+            if not chunk:
+                break
+            yield chunk
+
+
+def load_catalog(library, path, chunk_size=10_000):
+    # Returns (songs added, duplicate titles skipped)
+    added = total = 0
+
+    # A bulk load only allocates objects that stay alive, so the cyclic
+    # garbage collector's passes over them are wasted work
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for chunk in read_catalog(path, chunk_size):
+            added += library.add_songs(chunk)
+            total += len(chunk)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    return added, total - added
+
+
+def export_catalog(songs, path):
+    file_format = _catalog_format(path)
+    count = 0
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        if file_format == 'csv':
+            writer = csv.writer(file)
+            writer.writerow(CATALOG_FIELDS)
+            for song in songs:
+                writer.writerow((song.title, song.artist, song.album, song.genre, song.length))
+                count += 1
+        else:
+            for song in songs:
+                file.write(json.dumps({field: getattr(song, field) for field in CATALOG_FIELDS}))
+                file.write('\n')
+                count += 1
+    return count
+
+
+class MusicStore:
+    # SQLite file holding the library and every playlist. Opening a store
+    # only opens the database; songs are read when they are looked up.
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS songs (
+            title TEXT PRIMARY KEY,
+            artist TEXT NOT NULL,
+            album TEXT NOT NULL,
+            genre TEXT NOT NULL,
+            length REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS songs_artist ON songs (artist);
+        CREATE INDEX IF NOT EXISTS songs_album ON songs (album);
+        CREATE INDEX IF NOT EXISTS songs_genre ON songs (genre);
+        CREATE TABLE IF NOT EXISTS playlists (
+            name TEXT PRIMARY KEY
+        );
+        CREATE TABLE IF NOT EXISTS playlist_songs (
+            playlist TEXT NOT NULL REFERENCES playlists (name) ON DELETE CASCADE,
+            position INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            PRIMARY KEY (playlist, position)
+        );
+        CREATE INDEX IF NOT EXISTS playlist_songs_title ON playlist_songs (title, playlist);
+    """
+
+    def __init__(self, path, check_same_thread=True):
+        # Pass check_same_thread=False to share the store between threads
+        # behind a ThreadSafeMusicLibrary
+        self.path = path
+        self.connection = sqlite3.connect(path, check_same_thread=check_same_thread)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        self.connection.executescript(self.SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def playlist_names(self):
+        return [name for (name,) in self.connection.execute("SELECT name FROM playlists ORDER BY rowid")]
+
+    def save_playlist(self, playlist):
+        # Rewrites the playlist's rows in one transaction; for a new or
+        # reordered playlist. Adding or removing a song writes only its row.
+        with self.connection:
+            self.connection.execute("INSERT OR IGNORE INTO playlists (name) VALUES (?)", (playlist.name,))
+            self.connection.execute("DELETE FROM playlist_songs WHERE playlist = ?", (playlist.name,))
+            self.connection.executemany(
+                "INSERT INTO playlist_songs (playlist, position, title) VALUES (?, ?, ?)",
+                ((playlist.name, position, song.title) for position, song in enumerate(playlist)),
+            )
+
+    def add_playlist_song(self, name, title):
+        # Positions are sparse: a song goes after the current last one, and
+        # removing a song leaves a gap rather than renumbering the rest
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO playlist_songs (playlist, position, title) "
+                "SELECT ?, COALESCE(MAX(position), -1) + 1, ? FROM playlist_songs WHERE playlist = ?",
+                (name, title, name),
+            )
+
+    def remove_playlist_song(self, name, title):
+        with self.connection:
+            self.connection.execute("DELETE FROM playlist_songs WHERE playlist = ? AND title = ?", (name, title))
+
+    def playlists_with(self, title):
+        return [name for (name,) in self.connection.execute(
+            "SELECT playlist FROM playlist_songs WHERE title = ?", (title,))]
+
+    def load_playlist(self, name, library):
+        rows = self.connection.execute(
+            "SELECT s.title, s.artist, s.album, s.genre, s.length FROM playlist_songs p "
+            "JOIN songs s ON s.title = p.title WHERE p.playlist = ? ORDER BY p.position",
+            (name,),
+        )
+        playlist = Playlist(name, library)
+        for row in rows:
+            playlist.add_song(Song(*row))
+        return playlist
+
+    def delete_playlist(self, name):
+        with self.connection:
+            self.connection.execute("DELETE FROM playlists WHERE name = ?", (name,))
+
+
+class SQLiteMusicLibrary:
+    # MusicLibrary API served straight from a MusicStore. Lookups go through
+    # the SQLite indexes, so nothing has to be loaded at startup.
+    def __init__(self, store):
+        self.store = store
+        self.connection = store.connection
+        self.search_index = None
+        self.stats = None
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM songs").fetchone()[0]
+
+    def __iter__(self):
+        for row in self.connection.execute("SELECT title, artist, album, genre, length FROM songs ORDER BY rowid"):
+            yield Song(*row)
+
+    def add_song(self, song):
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT OR IGNORE INTO songs (title, artist, album, genre, length) VALUES (?, ?, ?, ?, ?)",
+                (song.title, song.artist, song.album, song.genre, song.length),
+            )
+        if cursor.rowcount == 1:
+            if self.search_index is not None:
+                self.search_index.add(song)
+            if self.stats is not None:
+                self.stats.add(song)
+        return cursor.rowcount == 1
+
+    def add_songs(self, songs):
+        # One transaction for the whole batch
+        if self.search_index is not None or self.stats is not None:
+            songs = list(songs)
+            seen = set()
+            for song in songs:
+                # Like INSERT OR IGNORE, keep only the first copy of a new title
+                if song.title in seen or self.get_songs_by_title(song.title) is not None:
+                    continue
+                seen.add(song.title)
+                if self.search_index is not None:
+                    self.search_index.add(song)
+                if self.stats is not None:
+                    self.stats.add(song)
+        before = self.connection.total_changes
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO songs (title, artist, album, genre, length) VALUES (?, ?, ?, ?, ?)",
+                ((song.title, song.artist, song.album, song.genre, song.length) for song in songs),
+            )
+        return self.connection.total_changes - before
+
+    def remove_song(self, title):
+        song = self.get_songs_by_title(title)
+        if song is not None:
+            with self.connection:
+                self.connection.execute("DELETE FROM songs WHERE title = ?", (title,))
+            if self.search_index is not None:
+                self.search_index.remove(title)
+            if self.stats is not None:
+                self.stats.remove(song)
+        return song
+
+    def _select(self, column, value):
+        rows = self.connection.execute(
+            f"SELECT title, artist, album, genre, length FROM songs WHERE {column} = ? ORDER BY rowid", (value,)
+        )
+        return [Song(*row) for row in rows]
+
+    def get_songs_by_artist(self, artist):
+        return self._select('artist', artist)
+
+    def get_songs_by_album(self, album):
+        return self._select('album', album)
+
+    def get_songs_by_genre(self, genre):
+        return self._select('genre', genre)
+
+    def get_songs_by_title(self, title):
+        songs = self._select('title', title)
+        return songs[0] if songs else None
+
+    def search(self, query, page=1, page_size=10):
+        # The index is built from the table on the first search only, so
+        # opening the store stays cheap
+        if self.search_index is None:
+            self.search_index = SongSearchIndex()
+            for song in self:
+                self.search_index.add(song)
+        return self.search_index.search(query, page, page_size)
+
+    def statistics(self):
+        if self.stats is None:
+            self.stats = LibraryStats()
+            for song in self:
+                self.stats.add(song)
+        return self.stats
+
+
+def main(db_path=None):
+    # With a database path the library and playlists persist between runs
+    store = MusicStore(db_path) if db_path else None
+    library = SQLiteMusicLibrary(store) if store else MusicLibrary()
+    playlists = PlaylistManager(library, store)
 
     while True:
         print("\nOptions:")
@@ -97,6 +1380,12 @@ def main():
         print("6. Reorder Songs in Playlist")
         print("7. Search Songs by Artist")
         print("8. Exit")
+        print("9. Import Catalog File (CSV or JSON lines)")
+        print("10. Export Catalog File")
+        print("11. Show Playlists Containing a Song")
+        print("12. Remove Song from All Playlists")
+        print("13. Search Songs (title, artist or album)")
+        print("14. Library Statistics")
 
         choice = input("Enter your choice: ")
 
@@ -115,8 +1404,9 @@ def main():
             while True:
                 try:
                     length_input = input("Enter length (in minutes:seconds): ")
-                    minutes, seconds = map(int, length_input.split(':'))
-                    length = float(minutes) + float(seconds) / 60
+                    if ':' not in length_input:
+                        raise ValueError
+                    length = parse_length(length_input)
                     break  # Exit the loop if input is valid
                 except (ValueError, ValueError, IndexError):
                     print("Invalid input for length. Please enter a valid format (e.g., 3:30 for 3 minutes and 30 seconds).")
@@ -125,23 +1415,30 @@ def main():
 
 
             song = Song(title, artist, album, genre, length)
-            library.add_song(song)
-            print("Song added to the library.")
+            if library.add_song(song):
+                print("Song added to the library.")
+            else:
+                print("A song with this title is already in the library.")
 
         elif choice == 2:
             name = input("Enter playlist name: ")
-            playlist = Playlist(name, library)
-            playlists.append(playlist)
-            print("Playlist created.")
+            playlist = playlists.create(name)
+            if playlist is not None:
+                if store:
+                    store.save_playlist(playlist)
+                print("Playlist created.")
+            else:
+                print("A playlist with this name already exists.")
 
         elif choice == 3:
             playlist_name = input("Enter playlist name: ")
-            playlist = next((p for p in playlists if p.name == playlist_name), None)
-            if playlist:
+            playlist = playlists.get(playlist_name)
+            if playlist is not None:
                 title = input("Enter song title to add: ")
                 song = library.get_songs_by_title(title)
                 if song:
-                    playlist.add_song(song)
+                    if playlist.add_song(song) and store:
+                        store.add_playlist_song(playlist.name, song.title)
                     print("Song added to the playlist.")
                 else:
                     print("Song not found in the library.")
@@ -157,12 +1454,15 @@ def main():
 
         elif choice == 5:
             playlist_name = input("Enter playlist name: ")
-            playlist = next((p for p in playlists if p.name == playlist_name), None)
-            if playlist:
+            playlist = playlists.get(playlist_name)
+            if playlist is not None:
                 title = input("Enter song title to remove: ")
                 song = library.get_songs_by_title(title)
-                if song in playlist.songs:
+                if song in playlist:
                     playlist.remove_song(song)
+                    if store:
+                        store.remove_playlist_song(playlist.name, song.title)
+                    print("Song removed from the playlist.")
                 else:
                     print("Song not found in the playlist.")
             else:
@@ -170,10 +1470,12 @@ def main():
 
         elif choice == 6:
             playlist_name = input("Enter playlist name: ")
-            playlist = next((p for p in playlists if p.name == playlist_name), None)
-            if playlist:
-                new_order = input("Enter the new order of song titles (comma-separated): ").split(',')
+            playlist = playlists.get(playlist_name)
+            if playlist is not None:
+                new_order = [title.strip() for title in input("Enter the new order of song titles (comma-separated): ").split(',')]
                 playlist.reorder_songs(new_order)
+                if store:
+                    store.save_playlist(playlist)
             else:
                 print("Playlist not found.")
 
@@ -188,11 +1490,76 @@ def main():
                 print(f"No songs found by {artist_name}.")
 
         elif choice == 8:
+            if store:
+                store.close()
             print("Exiting the program.")
             break
 
+        elif choice == 9:
+            path = input("Enter catalog file path: ")
+            try:
+                added, duplicates = load_catalog(library, path)
+                print(f"Imported {added} songs ({duplicates} duplicate titles skipped).")
+            except (OSError, ValueError) as e:
+                print(f"Error importing catalog '{path}': {e}")
+
+        elif choice == 10:
+            path = input("Enter export file path: ")
+            try:
+                count = export_catalog(library, path)
+                print(f"Exported {count} songs to {path}.")
+            except (OSError, ValueError) as e:
+                print(f"Error exporting catalog '{path}': {e}")
+
+        elif choice == 11:
+            title = input("Enter song title: ")
+            song = library.get_songs_by_title(title)
+            containing = playlists.playlists_containing(song) if song else []
+            if containing:
+                print(f"'{title}' is in: {', '.join(playlist.name for playlist in containing)}")
+            else:
+                print(f"'{title}' is not in any playlist.")
+
+        elif choice == 12:
+            title = input("Enter song title to remove from every playlist: ")
+            song = library.get_songs_by_title(title)
+            affected = playlists.remove_song_everywhere(song) if song else []
+            if store:
+                for playlist in affected:
+                    store.remove_playlist_song(playlist.name, song.title)
+            print(f"Song removed from {len(affected)} playlist(s).")
+
+        elif choice == 13:
+            query = input("Enter search text: ")
+            page = 1
+            while True:
+                results = library.search(query, page=page)
+                if not results:
+                    print("No songs found." if page == 1 else "No more results.")
+                    break
+                print(f"\nResults (page {page}):")
+                for song in results:
+                    print(f"{song.title} - {song.artist} ({song.album})")
+                if input("Show more? (y/n): ").strip().lower() != 'y':
+                    break
+                page += 1
+
+        elif choice == 14:
+            stats = library.statistics()
+            print(f"\nLibrary: {stats.count} songs, {stats.total_length:.2f} mns in total")
+            print("Songs per genre:")
+            for genre, count in sorted(stats.counts('genre').items(), key=lambda item: item[1], reverse=True):
+                print(f"  {genre}: {count}")
+            print("Top artists by total length:")
+            for artist, length in stats.top('artist', n=5, by='length'):
+                print(f"  {artist}: {length:.2f} mns")
+            print("Top albums by total length:")
+            for album, length in stats.top('album', n=5, by='length'):
+                print(f"  {album}: {length:.2f} mns")
+
         else:
             print("Invalid choice. Please enter a valid option.")
 
 if __name__ == "__main__":
-    main()
+    # Optional argument: path of a database file to keep the library in
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
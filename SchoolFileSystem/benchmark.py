@@ -0,0 +1,475 @@
+"""
+Benchmarks for the School Assessment System.
+
+Run from this directory:
+    python benchmark.py            # default sizes
+    python benchmark.py 10000      # custom row counts
+
+Hot-path suite, saved as JSON so runs can be compared for regressions:
+    python benchmark.py --suite 10000 --save before.json
+    python benchmark.py --suite 10000 --compare before.json
+"""
+
+import argparse
+import contextlib
+import hashlib
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.request import urlopen
+
+import numpy as np
+import pandas as pd
+
+# The suite harness shared with the other app lives at the repository root;
+# appended so this directory's modules still come first
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+import benchmark_suite
+from benchmark_suite import time_runs
+
+from schoolfilesystem import (AssessmentIndex, AssessmentReader, AssessmentStats, RunningStats, SchoolAssessmentCLI, WebFetcher,
+                              extract_student_names, iter_page_records)
+
+
+SUBJECTS = ['Mathematics', 'Physics', 'Chemistry', 'Science', 'English']
+DEFAULT_ROWS = [100_000]
+
+
+def write_text_file(path, rows, seed=42):
+    rng = random.Random(seed)
+    with open(path, 'w') as file:
+        for i in range(1, rows + 1):
+            scores = ", ".join(f"{subject} {rng.randint(40, 100)}" for subject in SUBJECTS)
+            file.write(f"Student {i}: {scores}\n")
+
+
+def write_csv_file(path, rows, seed=42):
+    rng = random.Random(seed)
+    with open(path, 'w') as file:
+        file.write("Student," + ",".join(SUBJECTS) + "\n")
+        for i in range(1, rows + 1):
+            file.write(f"Student {i}," + ",".join(str(rng.randint(40, 100)) for _ in SUBJECTS) + "\n")
+
+
+def legacy_read_text(file_path):
+    # The parser process_file and transfer_data each had a copy of
+    with open(file_path, 'r') as file:
+        lines = file.readlines()
+
+    data_list = []
+    for line in lines:
+        parts = line.strip().split(':')
+        student_info = parts[0].strip()
+        scores = parts[1].strip().split(', ')
+        scores_dict = {subject.split()[0]: int(subject.split()[1]) for subject in scores}
+        row = {'Student': student_info, **scores_dict}
+        data_list.append(row)
+
+    return pd.DataFrame(data_list)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def bench_text_ingestion(rows):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "Class.txt")
+        write_text_file(path, rows)
+
+        reader = AssessmentReader()
+        legacy_time, legacy = timed(legacy_read_text, path)
+        first_time, parsed = timed(reader.read, path)
+        cached_time, _ = timed(reader.read, path)
+        assert parsed.equals(legacy)
+
+    print(f"{rows:>10,} lines | legacy parser: {legacy_time * 1e3:8.1f} ms | "
+          f"engine (first read): {first_time * 1e3:8.1f} ms | cached: {cached_time * 1e3:6.3f} ms")
+
+
+def measure(func, *args):
+    # (seconds, peak traced bytes). tracemalloc slows allocation-heavy code a
+    # lot, so the time comes from a separate, untraced run.
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def stream_stats(reader, path, chunksize=50_000):
+    stats = {}
+    for chunk in reader.iter_chunks(path, chunksize):
+        for column in chunk.select_dtypes(include='number').columns:
+            stats.setdefault(column, RunningStats()).update(chunk[column])
+    return stats
+
+
+def bench_streaming(rows):
+    with tempfile.TemporaryDirectory() as directory:
+        for extension, write in (('csv', write_csv_file), ('txt', write_text_file)):
+            path = os.path.join(directory, f"District.{extension}")
+            write(path, rows)
+
+            full_time, full_peak = measure(lambda: AssessmentReader().read(path, header=0).describe())
+            stream_time, stream_peak = measure(stream_stats, AssessmentReader(), path)
+
+            print(f"{rows:>10,} rows | {extension} | full load: {full_time:6.2f} s, peak {full_peak / 2**20:7.1f} MiB | "
+                  f"streaming: {stream_time:6.2f} s, peak {stream_peak / 2**20:6.1f} MiB")
+
+
+def quietly(func, *args, **kwargs):
+    # The CLI methods report to stdout; keep benchmark output readable
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        return func(*args, **kwargs)
+
+
+def bench_transfers(transfers, rows=2_000):
+    with tempfile.TemporaryDirectory() as directory:
+        sources = []
+        for i in range(transfers):
+            path = os.path.join(directory, f"Class{i}.csv")
+            write_csv_file(path, rows, seed=i)
+            sources.append(path)
+
+        timings = {}
+        for incremental in (False, True):
+            cli = SchoolAssessmentCLI()
+            destination = os.path.join(directory, f"merged_{incremental}.csv")
+            start = time.perf_counter()
+            for source in sources:
+                quietly(cli.transfer_data, source, destination, incremental=incremental)
+            timings[incremental] = time.perf_counter() - start
+
+    print(f"{transfers:>10} transfers of {rows:,} rows | concat + rewrite: {timings[False]:6.2f} s | "
+          f"append-only: {timings[True]:6.2f} s")
+
+
+def write_excel_file(path, rows, seed=42):
+    rng = random.Random(seed)
+    data = pd.DataFrame(
+        [[f"Student {i}"] + [rng.randint(40, 100) for _ in SUBJECTS] for i in range(1, rows + 1)],
+        columns=['Student'] + SUBJECTS,
+    )
+    data.to_excel(path, index=False)
+
+
+def bench_batch_ingestion(files, rows=500):
+    with tempfile.TemporaryDirectory() as directory:
+        for i in range(files):
+            write_excel_file(os.path.join(directory, f"Class{i}.xlsx"), rows, seed=i)
+
+        timings = {}
+        for workers in (1, os.cpu_count() or 1, 4):
+            if workers in timings:
+                continue
+            cli = SchoolAssessmentCLI()
+            start = time.perf_counter()
+            quietly(cli.ingest_files, directory, workers=workers)
+            timings[workers] = time.perf_counter() - start
+            assert len(cli.data) == files * rows
+
+    results = " | ".join(f"{workers} worker(s): {seconds:6.2f} s" for workers, seconds in timings.items())
+    print(f"{files:>10} xlsx files of {rows} rows | {results}")
+
+
+def make_assessment(students, classes=50, seed=42):
+    # ASSESSMENT_COLUMNS frame with `students` rows spread over `classes` classes
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame({
+        'Class': pd.Series([f"Class{i}" for i in rng.integers(0, classes, students)], dtype='category'),
+        'Student': [f"Student {i}" for i in range(students)],
+    })
+    for subject in SUBJECTS:
+        data[subject] = rng.normal(75, 10, students).clip(0, 100).round()
+    return data
+
+
+def bench_analysis(students, terms=10):
+    # Fold `terms` assessments of the same students into the statistics
+    # store one at a time, then read the summary figures from it
+    stats = AssessmentStats()
+    base = make_assessment(students)
+    rng = np.random.default_rng(0)
+    add_seconds = []
+    for term in range(terms):
+        data = base.copy()
+        for subject in SUBJECTS:
+            data[subject] = (data[subject] + rng.normal(term, 5, students)).clip(0, 100).round()
+        seconds, _ = timed(stats.add, data, ('term', term))
+        add_seconds.append(seconds)
+
+    summary_seconds, analysis = timed(stats.analysis)
+    print(f"{analysis.rows:>10,} scores over {len(analysis.class_means)} classes, {terms} terms | "
+          f"add {students * len(SUBJECTS):,} scores: {sum(add_seconds) / terms * 1e3:8.1f} ms | "
+          f"summary: {summary_seconds * 1e3:6.1f} ms | "
+          f"{analysis.low_outliers.sum() + analysis.high_outliers.sum():,} outliers")
+
+
+def roster_page(page, students=200):
+    rows = "\n".join(f'<div class="student-name">Student {page}-{i}</div>' for i in range(students))
+    return f"<html><body><h1>Class {page}</h1>\n{rows}\n</body></html>".encode()
+
+
+class RosterHandler(BaseHTTPRequestHandler):
+    # Serves /class/<n> roster pages with an ETag, after a short delay that
+    # stands in for network latency
+    protocol_version = 'HTTP/1.1'
+    latency = 0.02
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        body = roster_page(self.path.rsplit('/', 1)[-1])
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def bench_queries(students, queries=1_000):
+    data = make_assessment(students)
+    build_seconds, index = timed(AssessmentIndex, data)
+
+    rng = random.Random(5)
+    names = [f"Student {rng.randrange(students)}" for _ in range(queries)]
+    scans = names[:20]
+
+    # The full scans the same questions needed before the index
+    def scan_student(name):
+        return data[data['Student'] == name]
+
+    def scan_top(_):
+        return data.nlargest(10, 'Physics')
+
+    def scan_below(_):
+        return data[(data[SUBJECTS] < 45).any(axis=1)]
+
+    lookups = [
+        ("student", scan_student, scans, index.student, names),
+        ("top 10", scan_top, [None] * 5, lambda _: index.top('Physics', 10), [None] * queries),
+        ("below 45 in any", scan_below, [None] * 5, lambda _: index.below(45), [None] * 20),
+    ]
+    results = []
+    for label, scan, scan_args, lookup, lookup_args in lookups:
+        results.append(f"{label}: scan {time_per_call(scan, scan_args) * 1e3:7.2f} ms, "
+                       f"index {time_per_call(lookup, lookup_args) * 1e3:7.3f} ms")
+    print(f"{students:>10,} students | build: {build_seconds:5.2f} s | " + " | ".join(results))
+
+
+def time_per_call(func, args):
+    start = time.perf_counter()
+    for arg in args:
+        func(arg)
+    return (time.perf_counter() - start) / len(args)
+
+
+def write_roster_page(path, students, seed=42):
+    # Student names, per-subject scores and an assessment table row per student
+    rng = random.Random(seed)
+    with open(path, 'w') as file:
+        file.write("<html><body><table><tr><th>Student</th>" + "".join(f"<th>{s}</th>" for s in SUBJECTS) + "</tr>\n")
+        for i in range(students):
+            scores = "".join(f'<td class="score" data-subject="{s}">{rng.randint(40, 100)}</td>' for s in SUBJECTS)
+            file.write(f'<tr><td><div class="student-name">Student {i}</div></td>{scores}</tr>\n')
+        file.write("</table></body></html>\n")
+
+
+def count_streamed_names(path):
+    with open(path, 'rb') as file:
+        chunks = iter(lambda: file.read(64 * 1024), b'')
+        return sum(1 for record in iter_page_records(chunks) if record[0] == 'student')
+
+
+def count_soup_names(path):
+    with open(path, 'rb') as file:
+        return len(extract_student_names(file.read(), 'html.parser'))
+
+
+def bench_html_extraction(students):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "roster.html")
+        write_roster_page(path, students)
+        size = os.path.getsize(path)
+
+        soup_time, soup_peak = measure(count_soup_names, path)
+        stream_time, stream_peak = measure(count_streamed_names, path)
+
+    print(f"{size / 2**20:>8.1f} MiB page | BeautifulSoup tree: {soup_time:6.2f} s, peak {soup_peak / 2**20:7.1f} MiB | "
+          f"streaming: {stream_time:6.2f} s, peak {stream_peak / 2**20:5.2f} MiB")
+
+
+def fetch_serially(urls):
+    # What fetch_web_data used to do for each page
+    names = []
+    for url in urls:
+        with urlopen(url) as response:
+            names.extend(extract_student_names(response.read(), 'html.parser'))
+    return names
+
+
+def bench_web_fetch(pages):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), RosterHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = [f"http://127.0.0.1:{server.server_port}/class/{page}" for page in range(pages)]
+
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            serial_seconds, _ = timed(fetch_serially, urls)
+            fetcher = WebFetcher(cache_dir=cache_dir, max_workers=8)
+            cold_seconds, cold = timed(fetcher.fetch_many, urls)
+            warm_seconds, warm = timed(fetcher.fetch_many, urls)
+            fetcher.close()
+            assert all(error is None for _, error in list(cold.values()) + list(warm.values()))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print(f"{pages:>10} pages | urlopen, one at a time: {pages / serial_seconds:7.1f} pages/s | "
+          f"8 pooled workers: {pages / cold_seconds:7.1f} pages/s | "
+          f"cached (304): {pages / warm_seconds:7.1f} pages/s")
+
+
+def startup_seconds(code, runs=5):
+    # Median wall time of a fresh interpreter running `code`
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def bench_startup():
+    bare = startup_seconds("pass")
+    lazy = startup_seconds("import schoolfilesystem; schoolfilesystem.SchoolAssessmentCLI()")
+    # What importing the module cost when pandas, numpy and bs4 were imported at the top
+    eager = startup_seconds("import schoolfilesystem, pandas, numpy, bs4; schoolfilesystem.SchoolAssessmentCLI()")
+    print(f"interpreter alone: {bare * 1e3:6.0f} ms | import + CLI, lazy imports: {lazy * 1e3:6.0f} ms | "
+          f"with pandas/numpy/bs4 up front: {eager * 1e3:6.0f} ms")
+
+
+CLASS_FILE_WRITERS = {'csv': write_csv_file, 'xlsx': write_excel_file, 'txt': write_text_file}
+
+
+def write_class_file(path, rows, seed=42):
+    # Synthetic class file in the format its extension names
+    CLASS_FILE_WRITERS[AssessmentReader.file_format(path)](path, rows, seed)
+
+
+def run_suite(rows, repeat=5):
+    # Times the hot paths on synthetic class files of `rows` students;
+    # returns {case: [seconds per run]}. Every run gets a fresh CLI, so
+    # the reader's cache starts cold.
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        paths = {}
+        for file_format in CLASS_FILE_WRITERS:
+            paths[file_format] = os.path.join(directory, f"Class1.{file_format}")
+            write_class_file(paths[file_format], rows)
+            results[f"process_file[{file_format},{rows}]"] = time_runs(
+                lambda cli: quietly(cli.process_file, paths[file_format]), setup=SchoolAssessmentCLI, repeat=repeat)
+
+        source = os.path.join(directory, "Class2.csv")
+        write_class_file(source, rows, seed=2)
+        destination = os.path.join(directory, "merged.csv")
+        filled = os.path.join(directory, "filled.csv")
+        quietly(SchoolAssessmentCLI().transfer_data, paths['csv'], filled)
+
+        def empty_destination():
+            if os.path.exists(destination):
+                os.remove(destination)
+            return SchoolAssessmentCLI()
+
+        def filled_destination():
+            with open(filled, 'rb') as original, open(destination, 'wb') as copy:
+                copy.write(original.read())
+            return SchoolAssessmentCLI()
+
+        results[f"transfer_data[{rows}] new destination"] = time_runs(
+            lambda cli: quietly(cli.transfer_data, source, destination), setup=empty_destination, repeat=repeat)
+        results[f"transfer_data[{rows}] onto {rows} rows"] = time_runs(
+            lambda cli: quietly(cli.transfer_data, source, destination), setup=filled_destination, repeat=repeat)
+
+        def loaded():
+            cli = SchoolAssessmentCLI()
+            quietly(cli.ingest_files, directory, workers=1)
+            return cli
+
+        results[f"generate_summary[{rows} rows per file]"] = time_runs(
+            lambda cli: quietly(cli.generate_summary), setup=loaded, repeat=repeat)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks for the School Assessment System.")
+    parser.add_argument('sizes', nargs='*', type=int, help="row counts to run instead of the defaults")
+    benchmark_suite.add_arguments(parser)
+    args = parser.parse_args()
+    benchmark_suite.run_requested(args, 'schoolfilesystem', run_suite, [10_000])
+    sizes = args.sizes
+
+    print("Startup time:")
+    bench_startup()
+
+    print("\nPlain-text ingestion:")
+    for rows in sizes or DEFAULT_ROWS:
+        bench_text_ingestion(rows)
+
+    print("\nFull load vs. chunked streaming:")
+    for rows in sizes or [1_000_000]:
+        bench_streaming(rows)
+
+    print("\nRepeated transfers into one destination:")
+    for transfers in [10, 50, 100]:
+        bench_transfers(transfers)
+
+    print("\nIncremental statistics store:")
+    for students in [20_000, 200_000]:
+        bench_analysis(students)
+
+    print("\nStudent queries, full scan vs. AssessmentIndex:")
+    for students in [20_000, 200_000]:
+        bench_queries(students)
+
+    print(f"\nFetching roster pages from a local server ({RosterHandler.latency * 1e3:g} ms latency):")
+    for pages in [100]:
+        bench_web_fetch(pages)
+
+    print("\nStudent names from one large roster page:")
+    for students in [10_000, 40_000]:
+        bench_html_extraction(students)
+
+    print(f"\nBatch ingestion, serial vs. process pool ({os.cpu_count()} CPUs):")
+    for files in [20, 100]:
+        bench_batch_ingestion(files)
+
+
+if __name__ == "__main__":
+    main()
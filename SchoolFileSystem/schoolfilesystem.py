@@ -1,12 +1,1096 @@
-import pandas as pd
+import csv
 from urllib.request import urlopen
-import datetime
-import traceback, random
-from bs4 import BeautifulSoup
+from urllib.parse import urljoin, urlsplit
+import argparse, contextlib, cProfile, datetime, importlib, importlib.util, pstats
+import codecs, functools, glob, hashlib, http.client, json, math, os, re, sys, threading, time, tracemalloc
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from html.parser import HTMLParser
+from itertools import islice
+
+
+class LazyModule:
+    # Stands in for a module and imports it on first attribute access, so
+    # starting up (or fetching web pages) doesn't pay for pandas and numpy
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attribute):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attribute)
+
+
+np = LazyModule('numpy')
+pd = LazyModule('pandas')
+bs4 = LazyModule('bs4')
+
+# Faster BeautifulSoup backend when installed
+HTML_PARSER = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+
+
+# Canonical layout for merged assessment data; (Class, Student) identifies a row
+ASSESSMENT_SUBJECTS = ['Mathematics', 'Physics', 'Chemistry', 'Science', 'English']
+ASSESSMENT_COLUMNS = ['Class', 'Student'] + ASSESSMENT_SUBJECTS
+
+
+def class_name_for(file_path):
+    # csv_data/Class1.csv -> "Class1"
+    return os.path.splitext(os.path.basename(file_path.strip()))[0]
+
+
+def normalized_students(data):
+    # "Student1" and "student 1" are the same student
+    return data['Student'].astype(str).str.replace(r'\s+', '', regex=True).str.lower()
+
+
+def normalize_student(name):
+    return re.sub(r'\s+', '', str(name)).lower()
+
+
+def student_keys(data):
+    # Identifies a student within their class
+    return data['Class'].astype(str) + '|' + normalized_students(data)
+
+
+class AssessmentReader:
+    # Single ingestion engine for every assessment file format. Each format
+    # has one parser, and parsed frames are cached by path, modification
+    # time and size, so reading the same unchanged file again skips the
+    # disk read and the parse.
+
+    # "Student 1: Mathematics 100, Physics 98, ..."
+    LINE_PATTERN = re.compile(r'\s*([^:]+?)\s*:(.*)')
+    SCORE_PATTERN = re.compile(r'([^\s,]+)\s+(-?\d+)')
+    NON_BLANK_LINE = re.compile(r'^[ \t]*\S', re.M)
+
+    def __init__(self, max_cached=32):
+        self.cache = OrderedDict()
+        self.max_cached = max_cached
+        self.parsers = {
+            'csv': self.read_csv,
+            'xlsx': self.read_excel,
+            'txt': self.read_text,
+        }
+
+    @staticmethod
+    def file_format(file_path):
+        return file_path.split('.')[-1].strip().lower()
+
+    def read(self, file_path, header=None, skiprows=None):
+        file_format = self.file_format(file_path)
+        parser = self.parsers.get(file_format)
+        if parser is None:
+            raise ValueError(f"Unsupported file format '{file_format}'")
+
+        # Text files name their subjects on every line, so header doesn't apply
+        if file_format == 'txt':
+            header = None
+
+        # Raises FileNotFoundError for missing files, as before
+        stat = os.stat(file_path)
+        key = (os.path.abspath(file_path), header, skiprows)
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        cached = self.cache.get(key)
+        if cached is not None and cached[0] == version:
+            self.cache.move_to_end(key)
+            frame = cached[1]
+        else:
+            frame = parser(file_path, header=header, skiprows=skiprows)
+            self.cache[key] = (version, frame)
+            self.cache.move_to_end(key)
+            if len(self.cache) > self.max_cached:
+                self.cache.popitem(last=False)
+
+        # Shallow copy so callers can rename or reassign columns without
+        # touching the cached frame
+        return frame.copy(deep=False)
+
+    def read_csv(self, file_path, header=None, skiprows=None):
+        data = pd.read_csv(file_path, header=header, skiprows=skiprows)
+        if header is None:
+            data.columns = range(len(data.columns))
+        return self.to_numeric(data)
+
+    def read_excel(self, file_path, header=None, skiprows=None):
+        data = pd.read_excel(file_path, header=header, skiprows=skiprows)
+        if header is None:
+            data.columns = range(len(data.columns))
+        return data
+
+    def read_text(self, file_path, header=None, skiprows=None):
+        with open(file_path, 'r') as file:
+            for _ in range(skiprows or 0):
+                next(file, None)
+            text = file.read()
+        return self.parse_text(text)
+
+    def parse_text(self, text):
+        # Class files list the same subjects in the same order on every line,
+        # so a pattern built from the first line parses the whole file in a
+        # single findall. Anything irregular falls back to line-by-line.
+        first_line = self.LINE_PATTERN.search(text)
+        if first_line is not None:
+            subjects = [subject for subject, _ in self.SCORE_PATTERN.findall(first_line.group(2))]
+            rows = self.file_pattern(tuple(subjects)).findall(text) if subjects else []
+            if rows and len(rows) == len(self.NON_BLANK_LINE.findall(text)):
+                data = pd.DataFrame(rows, columns=['Student', *subjects])
+                data['Student'] = data['Student'].str.strip()
+                data[subjects] = data[subjects].astype('int64')
+                return data
+
+        return self.read_text_lines(text)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=16)
+    def file_pattern(subjects):
+        scores = r',[ \t]*'.join(re.escape(subject) + r'[ \t]+(-?\d+)' for subject in subjects)
+        return re.compile(r'^([^:\n]*):[ \t]*' + scores + r'[ \t]*,?[ \t]*$', re.M)
+
+    def read_text_lines(self, text):
+        data_list = []
+        for line_number, line in enumerate(text.splitlines()):
+            if not line.strip():
+                continue
+            match = self.LINE_PATTERN.match(line)
+            if match is None:
+                raise ValueError(f"Line {line_number + 1} is not in 'Student: Subject score, ...' format")
+            row = {'Student': match.group(1)}
+            for subject, score in self.SCORE_PATTERN.findall(match.group(2)):
+                row[subject] = int(score)
+            data_list.append(row)
+
+        return pd.DataFrame(data_list)
+
+    def iter_chunks(self, file_path, chunksize=100_000):
+        # Stream a file as DataFrames of at most `chunksize` rows. Files are
+        # read with their header row and explicit dtypes (Class and Student
+        # as text, every subject column as float), and nothing is cached.
+        file_format = self.file_format(file_path)
+        if file_format == 'csv':
+            with open(file_path, 'r', newline='') as file:
+                columns = next(csv.reader(file), [])
+            dtypes = {}
+            for column in columns:
+                if column.strip() in ('Class', 'Student'):
+                    dtypes[column] = 'string'
+                elif column.strip() in ASSESSMENT_SUBJECTS:
+                    dtypes[column] = 'float64'
+            yield from pd.read_csv(file_path, dtype=dtypes, chunksize=chunksize)
+
+        elif file_format == 'txt':
+            with open(file_path, 'r') as file:
+                while True:
+                    lines = list(islice(file, chunksize))
+                    if not lines:
+                        break
+                    yield self.parse_text(''.join(lines))
+
+        elif file_format == 'xlsx':
+            # openpyxl's read-only mode walks the sheet row by row
+            from openpyxl import load_workbook
+            workbook = load_workbook(file_path, read_only=True, data_only=True)
+            try:
+                rows = workbook.active.iter_rows(values_only=True)
+                columns = list(next(rows, ()))
+                while True:
+                    chunk = list(islice(rows, chunksize))
+                    if not chunk:
+                        break
+                    yield self.to_numeric(pd.DataFrame(chunk, columns=columns))
+            finally:
+                workbook.close()
+
+        else:
+            raise ValueError(f"Unsupported file format '{file_format}'")
+
+    def align(self, data, class_name):
+        # Reshape any parsed frame into ASSESSMENT_COLUMNS. Frames read with
+        # header=None carry the column names in their first row, unless that
+        # row holds scores, in which case the columns are taken by position.
+        if len(data) and all(isinstance(column, int) for column in data.columns):
+            if pd.to_numeric(data.iloc[0], errors='coerce').notna().any():
+                if len(data.columns) == len(ASSESSMENT_COLUMNS):
+                    columns = ASSESSMENT_COLUMNS
+                elif len(data.columns) == len(ASSESSMENT_SUBJECTS) + 1:
+                    columns = ['Student'] + ASSESSMENT_SUBJECTS
+                else:
+                    raise ValueError(f"Data has no header row and {len(data.columns)} columns")
+                data = self.to_numeric(data.set_axis(columns, axis=1))
+            else:
+                data = self.to_numeric(data.iloc[1:].set_axis([str(name) for name in data.iloc[0]], axis=1))
+
+        data = data.rename(columns=lambda column: str(column).strip())
+        if data.empty and 'Student' not in data.columns:
+            return pd.DataFrame(columns=ASSESSMENT_COLUMNS)
+        if 'Class' not in data.columns:
+            data = data.assign(Class=class_name)
+        if 'Student' not in data.columns:
+            raise ValueError("Data has no 'Student' column")
+
+        aligned = data.reindex(columns=ASSESSMENT_COLUMNS)
+        aligned['Student'] = aligned['Student'].astype(str).str.strip()
+        for subject in ASSESSMENT_SUBJECTS:
+            aligned[subject] = pd.to_numeric(aligned[subject], errors='coerce')
+        return aligned.reset_index(drop=True)
+
+    @staticmethod
+    def to_numeric(data):
+        # Convert the columns that are entirely numeric and leave the rest
+        # alone (what apply(pd.to_numeric, errors='ignore') used to do)
+        for column in data.columns:
+            if not pd.api.types.is_numeric_dtype(data[column]):
+                try:
+                    data[column] = pd.to_numeric(data[column])
+                except (ValueError, TypeError):
+                    pass
+        return data
+
+
+SUPPORTED_FORMATS = ('csv', 'xlsx', 'txt')
+
+
+def find_assessment_files(pattern):
+    # A directory means every supported file under it; anything else is a glob
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, '**', '*')
+    paths = glob.glob(pattern, recursive=True)
+    return sorted(path for path in paths
+                  if os.path.isfile(path) and AssessmentReader.file_format(path) in SUPPORTED_FORMATS)
+
+
+def read_tagged(file_path):
+    # Worker for batch ingestion: parse one file into ASSESSMENT_COLUMNS plus
+    # the file it came from. Returns (path, frame, error) so that one bad
+    # file doesn't sink the whole batch.
+    try:
+        reader = AssessmentReader()
+        data = reader.align(reader.read(file_path, header=0), class_name_for(file_path))
+        return file_path, data.assign(Source=file_path), None
+    except Exception as e:
+        return file_path, None, str(e)
+
+
+class RunningStats:
+    # Count, sum, sum of squares, min and max of one score column, updated a
+    # chunk at a time so the column never has to be in memory at once. A
+    # histogram of whole-number scores 0-100 doubles as a quantile sketch.
+    # Two RunningStats merge into the stats of both sets of scores.
+    BINS = 101
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.total_squares = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        # Becomes an array of BINS counts on the first update
+        self.histogram = 0
+
+    @classmethod
+    def score_bins(cls, values):
+        # Scores outside 0-100 land in the end bins
+        return np.clip(np.rint(values), 0, cls.BINS - 1).astype(np.int64)
+
+    def update(self, values):
+        values = values.dropna()
+        if len(values):
+            self.count += len(values)
+            self.total += float(values.sum())
+            self.total_squares += float((values * values).sum())
+            self.minimum = min(self.minimum, float(values.min()))
+            self.maximum = max(self.maximum, float(values.max()))
+            self.histogram += np.bincount(self.score_bins(values.to_numpy(dtype='float64')), minlength=self.BINS)
+
+    def merge(self, other):
+        self.count += other.count
+        self.total += other.total
+        self.total_squares += other.total_squares
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.histogram += other.histogram
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else math.nan
+
+    @property
+    def std(self):
+        # Sample standard deviation
+        if self.count < 2:
+            return math.nan
+        variance = (self.total_squares - self.total * self.total / self.count) / (self.count - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    def quantile(self, q):
+        # Whole-number score below which a fraction q of the scores fall
+        if not self.count:
+            return math.nan
+        return int(np.searchsorted(np.cumsum(self.histogram), q * self.count))
+
+    def count_beyond(self, z):
+        # Approximate number of scores more than z standard deviations below
+        # (z < 0) or above (z > 0) the mean, read off the histogram
+        std = self.std
+        if not std > 0:
+            return 0
+        z_scores = (np.arange(self.BINS) - self.mean) / std
+        beyond = z_scores < z if z < 0 else z_scores > z
+        return int(self.histogram[beyond].sum())
+
+
+class AssessmentStats:
+    # Mergeable RunningStats per (class, subject) for the latest assessment
+    # of every class, and for the one before it so improvement compares a
+    # class with itself. add() costs O(new rows); the report reads only the
+    # rolled-up aggregates, so its cost doesn't grow with the rows ingested.
+    #
+    # add() takes an assessment label. Rows added under a class's current
+    # label (chunks of one file, the same file loaded again) merge into it,
+    # each student counted once. A new label starts a new assessment of
+    # that class: it replaces the class's figures in the report and the old
+    # one becomes the baseline for improvement.
+    KEEP_ROWS = 5
 
-class SchoolAssessmentCLI:
     def __init__(self):
-        self.data = pd.DataFrame()
+        # class -> [previous assessment or None, current assessment]
+        self.assessments = {}
+        # Roll-ups of every class's current assessment
+        self.cells = {}
+        self.classes = {}
+        self.subjects = {}
+        self.overall = RunningStats()
+        # The few lowest scores per subject and best student averages, for
+        # naming names in the report
+        self.lowest = None
+        self.top_students = None
+        self.version = 0
+        self.cached_analysis = None
+
+    @staticmethod
+    def new_assessment(label):
+        return {'label': label, 'cells': {}, 'seen': set(), 'lowest': None, 'top': None}
+
+    def add(self, data, assessment=None):
+        # `data` is in ASSESSMENT_COLUMNS layout; `assessment` labels the
+        # assessment it belongs to (a new one for every call when None).
+        # Returns the number of students added.
+        if assessment is None:
+            assessment = ('add', self.version)
+        classes = data['Class'].astype(str)
+
+        # Each class's entry for this assessment, starting a new one where
+        # the label differs from the class's current assessment
+        entries = {}
+        for class_name in classes.unique():
+            history = self.assessments.get(class_name)
+            if history is None or history[1]['label'] != assessment:
+                entries[class_name] = self.new_assessment(assessment)
+            else:
+                entries[class_name] = history[1]
+
+        # Plain object arrays: iterating pandas' Arrow-backed strings row by
+        # row is several times slower
+        class_codes, class_names = pd.factorize(classes)
+        class_names = list(class_names)
+        students = normalized_students(data).to_numpy(dtype=object)
+        seen = [entries[class_name]['seen'] for class_name in class_names]
+        is_new = np.fromiter((student not in seen[code] for code, student in zip(class_codes.tolist(), students)),
+                             dtype=bool, count=len(students))
+        is_new &= ~pd.DataFrame({'Class': class_codes, 'Student': students}).duplicated().to_numpy()
+        if not is_new.any():
+            return 0
+        data, class_codes, students = data[is_new], class_codes[is_new], students[is_new]
+        scores = data[ASSESSMENT_SUBJECTS].to_numpy(dtype='float64')
+        lowest = []
+
+        for position, subject in enumerate(ASSESSMENT_SUBJECTS):
+            values = scores[:, position]
+            present = ~np.isnan(values)
+            if not present.any():
+                continue
+            values, codes = values[present], class_codes[present]
+
+            # One vectorized pass per subject gives every class's aggregates
+            grouped = pd.Series(values).groupby(codes).agg(['count', 'sum', 'min', 'max'])
+            squares = np.bincount(codes, weights=values * values, minlength=len(class_names))
+            histograms = np.bincount(codes * RunningStats.BINS + RunningStats.score_bins(values),
+                                     minlength=len(class_names) * RunningStats.BINS).reshape(-1, RunningStats.BINS)
+
+            for code, count, total, minimum, maximum in grouped.itertuples():
+                cell = RunningStats()
+                cell.count, cell.total, cell.total_squares = int(count), float(total), float(squares[code])
+                cell.minimum, cell.maximum = float(minimum), float(maximum)
+                cell.histogram = histograms[code].copy()
+                entries[class_names[code]]['cells'].setdefault(subject, RunningStats()).merge(cell)
+
+            subject_scores = data[['Class', 'Student']].assign(Subject=subject, Score=scores[:, position])
+            lowest.append(subject_scores.dropna(subset=['Score']).sort_values('Score')
+                          .groupby('Class').head(self.KEEP_ROWS))
+
+        if not lowest:
+            return 0
+
+        lowest = pd.concat(lowest, ignore_index=True)
+        averages = data[['Class', 'Student']].assign(Average=pd.DataFrame(scores, index=data.index).mean(axis=1))
+        top = averages.sort_values('Average', ascending=False).groupby('Class').head(self.KEEP_ROWS)
+
+        order = np.argsort(class_codes, kind='stable')
+        bounds = np.cumsum(np.bincount(class_codes, minlength=len(class_names)))[:-1]
+        for code, positions in enumerate(np.split(order, bounds)):
+            entries[class_names[code]]['seen'].update(students[positions])
+
+        for class_name, entry in entries.items():
+            class_lowest = pd.concat([entry['lowest'], lowest[lowest['Class'] == class_name]], ignore_index=True)
+            entry['lowest'] = class_lowest.sort_values('Score').groupby('Subject').head(self.KEEP_ROWS)
+            class_top = pd.concat([entry['top'], top[top['Class'] == class_name]], ignore_index=True)
+            entry['top'] = class_top.nlargest(self.KEEP_ROWS, 'Average')
+
+            history = self.assessments.get(class_name)
+            if history is None:
+                self.assessments[class_name] = [None, entry]
+            elif history[1] is not entry:
+                # The superseded assessment only needs its aggregates now
+                history[1]['seen'] = None
+                self.assessments[class_name] = [history[1], entry]
+
+        self.roll_up()
+        self.version += 1
+        return len(data)
+
+    def roll_up(self):
+        # Rebuild the report aggregates from every class's current
+        # assessment: O(classes x subjects), whatever the number of rows
+        self.cells, self.classes, self.subjects = {}, {}, {}
+        self.overall = RunningStats()
+        lowest, top = [], []
+        for class_name, (_, current) in self.assessments.items():
+            for subject, cell in current['cells'].items():
+                self.cells[(class_name, subject)] = cell
+                self.classes.setdefault(class_name, RunningStats()).merge(cell)
+                self.subjects.setdefault(subject, RunningStats()).merge(cell)
+                self.overall.merge(cell)
+            lowest.append(current['lowest'])
+            top.append(current['top'])
+
+        lowest = pd.concat(lowest, ignore_index=True)
+        self.lowest = lowest.sort_values('Score').groupby('Subject').head(self.KEEP_ROWS).reset_index(drop=True)
+        self.top_students = pd.concat(top, ignore_index=True).nlargest(self.KEEP_ROWS, 'Average')
+
+    def improvement_stats(self):
+        # subject -> (RunningStats now, RunningStats in the previous
+        # assessment), pooled over the classes assessed more than once, so
+        # each class is only ever compared with itself
+        now, before = {}, {}
+        for previous, current in self.assessments.values():
+            if previous is None:
+                continue
+            for subject, cell in current['cells'].items():
+                if subject in previous['cells']:
+                    now.setdefault(subject, RunningStats()).merge(cell)
+                    before.setdefault(subject, RunningStats()).merge(previous['cells'][subject])
+        return {subject: (now[subject], before[subject]) for subject in now}
+
+    def analysis(self):
+        # AssessmentAnalysis of everything added so far, rebuilt only after add()
+        if self.cached_analysis is None or self.cached_analysis.version != self.version:
+            self.cached_analysis = AssessmentAnalysis(self)
+        return self.cached_analysis
+
+
+class AssessmentAnalysis:
+    # Every figure the summary report needs, derived from the aggregates in
+    # an AssessmentStats. Costs O(classes x subjects), not O(rows).
+    OUTLIER_Z = 2.0
+
+    def __init__(self, stats):
+        self.version = stats.version
+        self.rows = stats.overall.count
+        self.average_score = stats.overall.mean
+        self.median_score = stats.overall.quantile(0.5)
+
+        self.class_means = pd.Series({name: cell.mean for name, cell in stats.classes.items()},
+                                     dtype='float64').sort_values(ascending=False)
+        self.class_ranks = self.class_means.rank(ascending=False, method='min').astype(int)
+        self.subject_means = pd.Series({name: cell.mean for name, cell in stats.subjects.items()}, dtype='float64')
+        self.subject_stds = pd.Series({name: cell.std for name, cell in stats.subjects.items()}, dtype='float64')
+        self.class_subject_means = pd.Series({key: cell.mean for key, cell in stats.cells.items()},
+                                             dtype='float64').unstack()
+
+        # Percentage change of each subject's mean since the previous
+        # assessment of the same classes
+        self.improvement = pd.Series({subject: (now.mean - before.mean) / before.mean * 100
+                                      for subject, (now, before) in stats.improvement_stats().items()
+                                      if before.mean}, dtype='float64')
+
+        # Scores more than OUTLIER_Z standard deviations from their subject's mean
+        self.low_outliers = pd.Series({name: cell.count_beyond(-self.OUTLIER_Z) for name, cell in stats.subjects.items()}, dtype='int64')
+        self.high_outliers = pd.Series({name: cell.count_beyond(self.OUTLIER_Z) for name, cell in stats.subjects.items()}, dtype='int64')
+        lowest = stats.lowest.assign(Z=(stats.lowest['Score'] - stats.lowest['Subject'].map(self.subject_means))
+                                     / stats.lowest['Subject'].map(self.subject_stds))
+        self.lowest_outliers = lowest[lowest['Z'] < -self.OUTLIER_Z].sort_values('Z')
+        self.top_students = stats.top_students
+
+    @property
+    def weakest_class_subject(self):
+        # (class, subject, mean) with the lowest mean score
+        stacked = self.class_subject_means.stack()
+        (class_name, subject), mean = stacked.idxmin(), stacked.min()
+        return class_name, subject, mean
+
+
+class RosterExtractor(HTMLParser):
+    # Event-driven extraction from school pages. Fed the page a chunk at a
+    # time, it appends records to self.records as soon as they're complete:
+    #   ('student', name)                  <div class="student-name">
+    #   ('score', student, subject, score) <... class="score" data-subject="...">
+    #   ('row', {header: cell, ...})       assessment table rows
+    # A score's student is the last student-name div or, inside a table
+    # row, the row's Student cell (None if the table has no such column).
+    # Only the element being read is held, never the document or a DOM.
+    VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+                 'link', 'meta', 'source', 'track', 'wbr'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.records = []
+        self.student = None
+        # Element whose text is being collected: (kind, subject, depth)
+        self.capture = None
+        self.text = []
+        # Innermost table's header, current row and current cell
+        self.table_depth = 0
+        self.header = None
+        self.row = None
+        self.cell = None
+        # (subject, score) read in the current row, emitted with the row
+        self.row_scores = []
+
+    def handle_starttag(self, tag, attrs):
+        if self.capture is not None:
+            if tag not in self.VOID_TAGS:
+                self.capture = self.capture[:2] + (self.capture[2] + 1,)
+            return
+
+        if tag == 'table':
+            self.table_depth += 1
+            self.header = None
+        elif tag == 'tr' and self.table_depth:
+            self.row, self.row_scores = [], []
+        elif tag in ('td', 'th') and self.row is not None:
+            self.cell = []
+
+        classes = (dict(attrs).get('class') or '').split()
+        if 'student-name' in classes and tag == 'div':
+            self.capture, self.text = ('student', None, 1), []
+        elif 'score' in classes and tag not in self.VOID_TAGS:
+            self.capture, self.text = ('score', dict(attrs).get('data-subject'), 1), []
+
+    def handle_endtag(self, tag):
+        if self.capture is not None:
+            kind, subject, depth = self.capture
+            if depth > 1:
+                self.capture = (kind, subject, depth - 1)
+                return
+            text = ''.join(self.text).strip()
+            self.capture, self.text = None, []
+            if kind == 'student':
+                self.student = text
+                self.records.append(('student', text))
+            else:
+                try:
+                    score = float(text)
+                except ValueError:
+                    score = None
+                if score is None:
+                    pass
+                elif self.row is not None:
+                    self.row_scores.append((subject, score))
+                else:
+                    self.records.append(('score', self.student, subject, score))
+            if self.cell is not None:
+                self.cell.append(text)
+
+        if tag in ('td', 'th') and self.cell is not None:
+            self.row.append((tag, ''.join(self.cell).strip()))
+            self.cell = None
+        elif tag == 'tr' and self.row is not None:
+            self.end_row()
+        elif tag == 'table' and self.table_depth:
+            if self.row is not None:
+                self.end_row()
+            self.table_depth -= 1
+            self.header = self.row = self.cell = None
+
+    def end_row(self):
+        row, self.row = self.row, None
+        values = dict(zip(self.header, (text for _, text in row))) if self.header is not None else {}
+        student = values.get('Student') or None
+        for subject, score in self.row_scores:
+            self.records.append(('score', student, subject, score))
+        self.row_scores = []
+        if not row:
+            return
+        if all(tag == 'th' for tag, _ in row):
+            self.header = [text for _, text in row]
+        elif self.header is not None:
+            self.records.append(('row', values))
+
+    def handle_data(self, data):
+        if self.capture is not None:
+            self.text.append(data)
+        elif self.cell is not None:
+            self.cell.append(data)
+
+
+def iter_page_records(chunks, encoding='utf-8'):
+    # Records from an HTML page given as an iterable of byte chunks
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    extractor = RosterExtractor()
+    for chunk in chunks:
+        extractor.feed(decoder.decode(chunk))
+        records, extractor.records = extractor.records, []
+        yield from records
+    extractor.feed(decoder.decode(b'', final=True))
+    extractor.close()
+    yield from extractor.records
+
+
+def read_page(records):
+    # Collect page records into names, (student, subject, score) and table rows
+    page = {'student_names': [], 'scores': [], 'rows': []}
+    for record in records:
+        if record[0] == 'student':
+            page['student_names'].append(record[1])
+        elif record[0] == 'score':
+            page['scores'].append(record[1:])
+        else:
+            page['rows'].append(record[1])
+    return page
+
+
+def extract_student_names(html_content, parser=HTML_PARSER):
+    # Student names are in <div class="student-name"> tags
+    soup = bs4.BeautifulSoup(html_content, parser)
+    return [div.text.strip() for div in soup.find_all('div', class_='student-name')]
+
+
+class AssessmentIndex:
+    # Read-only query layer over assessment data in ASSESSMENT_COLUMNS
+    # layout. Built once in O(n log n): dicts from student, (class, student)
+    # and class to row positions, and per subject the row positions sorted
+    # by score. Student and class lookups are then O(1) plus the rows
+    # returned, top-k is O(k) and threshold queries O(log n + k).
+    def __init__(self, data):
+        keys = student_keys(data)
+        data = data[~keys.duplicated()].reset_index(drop=True)
+        keys = keys[~keys.duplicated()].reset_index(drop=True)
+        for subject in ASSESSMENT_SUBJECTS:
+            data[subject] = pd.to_numeric(data[subject], errors='coerce')
+        self.data = data
+
+        self.by_key = dict(zip(keys.to_numpy(dtype=object), range(len(data))))
+        self.by_student = self.group_positions(normalized_students(data))
+        self.by_class = self.group_positions(data['Class'].astype(str))
+
+        # subject -> (row positions in ascending score order, those scores)
+        self.rankings = {}
+        for subject in ASSESSMENT_SUBJECTS:
+            scores = data[subject].to_numpy(dtype='float64')
+            positions = np.flatnonzero(~np.isnan(scores))
+            order = positions[np.argsort(scores[positions], kind='stable')]
+            self.rankings[subject] = (order, scores[order])
+
+    @staticmethod
+    def group_positions(values):
+        # value -> array of the row positions holding it. factorize and one
+        # stable argsort beat groupby().indices by a wide margin on strings.
+        codes, uniques = pd.factorize(values)
+        order = np.argsort(codes, kind='stable')
+        bounds = np.cumsum(np.bincount(codes, minlength=len(uniques)))[:-1]
+        return dict(zip(np.asarray(uniques, dtype=object), np.split(order, bounds)))
+
+    def __len__(self):
+        return len(self.data)
+
+    def subject(self, subject):
+        # Case-insensitive subject name -> canonical one
+        for name in ASSESSMENT_SUBJECTS:
+            if name.lower() == str(subject).strip().lower():
+                return name
+        raise ValueError(f"Unknown subject '{subject}'. Choose from {', '.join(ASSESSMENT_SUBJECTS)}")
+
+    def rows(self, positions):
+        return self.data.iloc[positions]
+
+    def student(self, name, class_name=None):
+        # Scores of every student called `name`, or only the one in class_name
+        if class_name is not None:
+            position = self.by_key.get(f"{class_name}|{normalize_student(name)}")
+            return self.rows([] if position is None else [position])
+        return self.rows(self.by_student.get(normalize_student(name), []))
+
+    def class_roster(self, class_name):
+        return self.rows(self.by_class.get(str(class_name), []))
+
+    @staticmethod
+    def checked_k(k):
+        # A negative k would slice from the other end instead of failing
+        if k < 1:
+            raise ValueError(f"Number of students must be at least 1, not {k}")
+        return k
+
+    def top(self, subject, k=10):
+        # k best scores in subject, best first
+        order, _ = self.rankings[self.subject(subject)]
+        return self.rows(order[::-1][:self.checked_k(k)])
+
+    def bottom(self, subject, k=10):
+        order, _ = self.rankings[self.subject(subject)]
+        return self.rows(order[:self.checked_k(k)])
+
+    def below(self, threshold, subject=None):
+        # Students scoring below threshold in subject (lowest first), or in
+        # any subject when subject is None (in row order)
+        subjects = ASSESSMENT_SUBJECTS if subject is None else [self.subject(subject)]
+        matches = []
+        for name in subjects:
+            order, scores = self.rankings[name]
+            matches.append(order[:np.searchsorted(scores, threshold, side='left')])
+        positions = np.concatenate(matches)
+        if subject is None:
+            positions = np.unique(positions)
+        return self.rows(positions)
+
+    def at_least(self, threshold, subject):
+        # Students scoring threshold or more in subject, best first
+        order, scores = self.rankings[self.subject(subject)]
+        return self.rows(order[np.searchsorted(scores, threshold, side='left'):][::-1])
+
+    def above(self, threshold, subject):
+        # Students scoring more than threshold in subject, best first
+        order, scores = self.rankings[self.subject(subject)]
+        return self.rows(order[np.searchsorted(scores, threshold, side='right'):][::-1])
+
+
+class WebFetcher:
+    # Fetches school pages concurrently. Each worker thread keeps one open
+    # connection per host, every request has a timeout, and responses are
+    # cached on disk with their ETag/Last-Modified so unchanged pages come
+    # back as 304 Not Modified without a body. Pages are parsed as they
+    # stream in with RosterExtractor; passing parser='lxml' or
+    # 'html.parser' builds a BeautifulSoup tree instead (names only).
+    CHUNK_SIZE = 64 * 1024
+    REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+    MAX_REDIRECTS = 5
+
+    def __init__(self, cache_dir='.web_cache', timeout=10, max_workers=8, parser=None):
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.parser = parser
+        self.local = threading.local()
+        # url -> page parsed from its cached body
+        self.parsed = {}
+        # Response body bytes received, for instrumentation
+        self.bytes_read = 0
+        self.bytes_lock = threading.Lock()
+        # Kept between batches so worker threads keep their connections
+        self.executor = None
+        # Every thread's connections, so close() can reach them all
+        self.open_connections = []
+        self.connections_lock = threading.Lock()
+
+    def connection(self, scheme, host, port):
+        connections = self.local.__dict__.setdefault('connections', {})
+        key = (scheme, host, port)
+        if key not in connections:
+            connection_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+            connections[key] = connection_class(host, port, timeout=self.timeout)
+            with self.connections_lock:
+                self.open_connections.append(connections[key])
+        return connections[key]
+
+    def cache_paths(self, url):
+        name = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, name + '.json'), os.path.join(self.cache_dir, name + '.html')
+
+    def read_chunks(self, file):
+        while True:
+            chunk = file.read(self.CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+    def read_response(self, response):
+        for chunk in self.read_chunks(response):
+            with self.bytes_lock:
+                self.bytes_read += len(chunk)
+            yield chunk
+
+    def open_page(self, url):
+        # (iterator of body chunks, True if the server answered 304 Not
+        # Modified, charset, final URL after redirects). The iterator must be
+        # consumed before the next request on this thread.
+        for _ in range(self.MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            if parts.scheme not in ('http', 'https'):
+                response = urlopen(url, timeout=self.timeout)
+                return self.close_after(response, self.read_response(response)), False, 'utf-8', url
+
+            # The cache is keyed on the URL actually requested, so a
+            # redirected page is cached under its final URL
+            meta_path, body_path = self.cache_paths(url)
+            headers = {}
+            if os.path.exists(meta_path) and os.path.exists(body_path):
+                with open(meta_path) as file:
+                    meta = json.load(file)
+                if meta.get('etag'):
+                    headers['If-None-Match'] = meta['etag']
+                if meta.get('last_modified'):
+                    headers['If-Modified-Since'] = meta['last_modified']
+
+            path = parts.path or '/'
+            if parts.query:
+                path += '?' + parts.query
+            port = parts.port or (443 if parts.scheme == 'https' else 80)
+
+            # A kept-alive connection the server has since closed fails on
+            # first use; reconnect once
+            for attempt in range(2):
+                connection = self.connection(parts.scheme, parts.hostname, port)
+                try:
+                    connection.request('GET', path, headers=headers)
+                    response = connection.getresponse()
+                    break
+                except (http.client.RemoteDisconnected, http.client.CannotSendRequest, ConnectionError):
+                    connection.close()
+                    if attempt:
+                        raise
+
+            if response.status in self.REDIRECT_STATUSES and response.getheader('Location'):
+                response.read()
+                url = urljoin(url, response.getheader('Location'))
+                if urlsplit(url).scheme not in ('http', 'https'):
+                    raise ValueError(f"Redirected to unsupported URL '{url}'")
+                continue
+
+            charset = response.headers.get_content_charset() or 'utf-8'
+            if response.status == 304:
+                response.read()
+                return self.read_cached(body_path), True, charset, url
+            if response.status != 200:
+                response.read()
+                raise ValueError(f"HTTP {response.status} {response.reason}")
+
+            etag, last_modified = response.getheader('ETag'), response.getheader('Last-Modified')
+            if not (etag or last_modified):
+                return self.read_response(response), False, charset, url
+            meta = {'url': url, 'etag': etag, 'last_modified': last_modified}
+            return self.cache_while_reading(response, meta, meta_path, body_path), False, charset, url
+
+        raise ValueError(f"More than {self.MAX_REDIRECTS} redirects")
+
+    def close_after(self, file, chunks):
+        with file:
+            yield from chunks
+
+    def read_cached(self, body_path):
+        # The file is only opened once iteration starts, so closing the
+        # iterator unread (a reused parse) leaves nothing open
+        with open(body_path, 'rb') as file:
+            yield from self.read_chunks(file)
+
+    def cache_while_reading(self, response, meta, meta_path, body_path):
+        # Pass chunks through while writing them to the cache; the entry
+        # only counts once the whole body has arrived
+        os.makedirs(self.cache_dir, exist_ok=True)
+        partial_path = f"{body_path}.{threading.get_ident()}.part"
+        with open(partial_path, 'wb') as file:
+            for chunk in self.read_response(response):
+                file.write(chunk)
+                yield chunk
+        os.replace(partial_path, body_path)
+        with open(meta_path, 'w') as file:
+            json.dump(meta, file)
+
+    def fetch_page(self, url):
+        # Student names, scores and table rows on `url`. Parsing costs more
+        # than the request, so an unchanged page reuses the last parse.
+        chunks, not_modified, charset, url = self.open_page(url)
+        if not_modified and url in self.parsed:
+            chunks.close()
+            return self.parsed[url]
+
+        if self.parser is None:
+            page = read_page(iter_page_records(chunks, charset))
+        else:
+            page = read_page([])
+            page['student_names'] = extract_student_names(b''.join(chunks), self.parser)
+        self.parsed[url] = page
+        return page
+
+    def fetch_many(self, urls):
+        # url -> (page, error); at most max_workers requests in flight
+        def fetch_one(url):
+            try:
+                return url, (self.fetch_page(url), None)
+            except Exception as e:
+                return url, (None, str(e) or type(e).__name__)
+
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return dict(self.executor.map(fetch_one, urls))
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        with self.connections_lock:
+            connections, self.open_connections = self.open_connections, []
+        for connection in connections:
+            connection.close()
+
+
+class PipelineMetrics:
+    # Opt-in instrumentation for SchoolAssessmentCLI. Every stage call adds
+    # its wall time, rows, bytes read and peak traced memory to that stage's
+    # totals. Rows and bytes go to the innermost open stage. Memory tracing
+    # slows allocation-heavy code, so it can be left off.
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.stages = OrderedDict()
+        self.active = []
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        current = {'rows': 0, 'bytes': 0, 'peak': 0, 'start_memory': 0}
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            traced, peak = tracemalloc.get_traced_memory()
+            # Resetting the peak for this stage would lose the enclosing
+            # stage's peak so far, so bank it first
+            if self.active:
+                parent = self.active[-1]
+                parent['peak'] = max(parent['peak'], peak - parent['start_memory'])
+            tracemalloc.reset_peak()
+            current['start_memory'] = traced
+
+        self.active.append(current)
+        start = time.perf_counter()
+        try:
+            yield current
+        finally:
+            elapsed = time.perf_counter() - start
+            self.active.pop()
+            if self.trace_memory:
+                current['peak'] = max(current['peak'], tracemalloc.get_traced_memory()[1] - current['start_memory'])
+                if self.active:
+                    parent = self.active[-1]
+                    parent['peak'] = max(parent['peak'], current['start_memory'] + current['peak'] - parent['start_memory'])
+
+            totals = self.stages.setdefault(name, {'calls': 0, 'seconds': 0.0, 'rows': 0, 'bytes': 0, 'peak_memory_bytes': 0})
+            totals['calls'] += 1
+            totals['seconds'] += elapsed
+            totals['rows'] += current['rows']
+            totals['bytes'] += current['bytes']
+            totals['peak_memory_bytes'] = max(totals['peak_memory_bytes'], current['peak'])
+
+    def count(self, rows=0, bytes_read=0):
+        if self.active:
+            self.active[-1]['rows'] += rows
+            self.active[-1]['bytes'] += bytes_read
+
+    def to_json(self):
+        return json.dumps({'stages': self.stages}, indent=2)
+
+    def to_prometheus(self):
+        metrics = [
+            ('school_stage_calls_total', 'counter', 'calls', "Number of times each pipeline stage ran"),
+            ('school_stage_seconds_total', 'counter', 'seconds', "Wall time spent in each pipeline stage"),
+            ('school_stage_rows_total', 'counter', 'rows', "Rows processed by each pipeline stage"),
+            ('school_stage_bytes_total', 'counter', 'bytes', "Bytes read by each pipeline stage"),
+            ('school_stage_peak_memory_bytes', 'gauge', 'peak_memory_bytes', "Largest traced memory peak of one stage call"),
+        ]
+        lines = []
+        for metric, metric_type, key, description in metrics:
+            lines.append(f"# HELP {metric} {description}")
+            lines.append(f"# TYPE {metric} {metric_type}")
+            for stage, totals in self.stages.items():
+                # Exact values: counters like rows and bytes outgrow %g's
+                # six significant digits
+                value = repr(totals[key]) if isinstance(totals[key], float) else str(totals[key])
+                lines.append(f'{metric}{{stage="{stage}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def save(self, path):
+        # Prometheus text for .prom/.txt, JSON otherwise
+        text = self.to_prometheus() if path.endswith(('.prom', '.txt')) else self.to_json()
+        with open(path, 'w') as file:
+            file.write(text)
+
+    def print_report(self):
+        print(f"{'Stage':<20} {'Calls':>6} {'Seconds':>9} {'Rows':>10} {'Bytes':>12} {'Peak MiB':>9}")
+        for stage, totals in self.stages.items():
+            peak = f"{totals['peak_memory_bytes'] / 2**20:.1f}" if self.trace_memory else '-'
+            print(f"{stage:<20} {totals['calls']:>6} {totals['seconds']:>9.3f} {totals['rows']:>10,} "
+                  f"{totals['bytes']:>12,} {peak:>9}")
+
+
+def instrumented(method):
+    # Runs a SchoolAssessmentCLI method as a stage of self.metrics, when set
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.metrics is None:
+            return method(self, *args, **kwargs)
+        with self.metrics.stage(method.__name__):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+@contextlib.contextmanager
+def profiled(output_path=None, top=25):
+    # cProfile everything inside the block; dump the stats to output_path
+    # (for pstats or snakeviz), or print the top functions by cumulative time
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        if output_path:
+            profiler.dump_stats(output_path)
+            print(f"Profile written to {output_path}")
+        else:
+            pstats.Stats(profiler).sort_stats('cumulative').print_stats(top)
+
+
+class SchoolAssessmentCLI:
+    # Files bigger than this are streamed instead of loaded whole
+    STREAMING_THRESHOLD_BYTES = 50 * 1024 * 1024
+
+    def __init__(self, metrics=None):
+        self.data = None
+        # File self.data was last loaded from, and the AssessmentIndex over it
+        self.data_file = None
+        self.index = None
+        # PipelineMetrics to record every stage in, or None
+        self.metrics = metrics
+        self.reader = AssessmentReader()
+        self.file_stats = {}
+        # destination path -> ((mtime, size), set of student keys already in it)
+        self.destination_keys = {}
+        # Aggregates of every score ingested, read by the summary report
+        self.stats = AssessmentStats()
+        self.web_data = None
+        self.web_fetcher = WebFetcher()
+        # Loads, transfers, fetches and summaries that failed, for the exit
+        # status of batch runs
+        self.failures = 0
 
     def display_menu(self):
         print("\nSchool Assessment System")
@@ -15,97 +1099,152 @@ class SchoolAssessmentCLI:
         print("3. Fetch Web Data")
         print("4. Analyze Content")
         print("5. Generate Summary")
+        print("6. Batch Process Files (directory or glob)")
+        print("7. Query Students")
         print("0. Exit")
 
-    def process_file(self, file_path):
+    @instrumented
+    def process_file(self, file_path, preview_rows=10):
         try:
+            if os.path.getsize(file_path) > self.STREAMING_THRESHOLD_BYTES:
+                self.stream_file(file_path)
+                return
+
             file_format = file_path.split('.')[-1].strip()  # Remove leading/trailing spaces
             print(f"Processing file: {file_path}, Format: {file_format}")
 
-            if file_format == 'csv':
-                try:
-                    # For pandas version >= 1.3.0
-                    self.data = pd.read_csv(file_path, header=None, warn_bad_lines=True)
-                except TypeError:
-                    # For pandas version < 1.3.0
-                    self.data = pd.read_csv(file_path, header=None)
-
-                # Ensure numeric columns are correctly interpreted
-                self.data.columns = range(len(self.data.columns))
-                self.data = self.data.apply(pd.to_numeric, errors='ignore')
-
-            elif file_format == 'xlsx':
-                self.data = pd.read_excel(file_path, header=None)  # Specify no header
-
-            elif file_format == 'txt':
-                # Custom logic to process plain text file
-                with open(file_path, 'r') as file:
-                    lines = file.readlines()
-
-                # Extracting information from each line
-                data_list = []
-                for line in lines:
-                    parts = line.strip().split(':')
-                    student_info = parts[0].strip()
-                    scores = parts[1].strip().split(', ')
-                    scores_dict = {subject.split()[0]: int(subject.split()[1]) for subject in scores}
-                    row = {'Student': student_info, **scores_dict}
-                    data_list.append(row)
-
-                # Creating a DataFrame from the list of dictionaries
-                self.data = pd.DataFrame(data_list)
-
-            else:
-                raise ValueError("Unsupported file format")
+            self.data = self.reader.read(file_path, header=None)
+            self.data_file = file_path
 
             # Resetting index to remove both default and header index
             self.data = self.data.reset_index(drop=True)
+            self.record(self.data, file_path)
+            self.count(bytes_read=os.path.getsize(file_path))
 
             # Display result in the terminal
             print(f"File processed successfully: {file_path}")
-            print("All results in the file:")
-            with pd.option_context('display.max_rows', None, 'display.max_columns', None):
-                print(self.data)
+            print(f"First {preview_rows} rows:")
+            with pd.option_context('display.max_columns', None):
+                print(self.data.head(preview_rows))
 
         except FileNotFoundError:
             print(f"Error: File '{file_path}' not found.")
+            self.failures += 1
         except Exception as e:
             print(f"Error processing file '{file_path}': {e}")
+            self.failures += 1
+
+    def count(self, rows=0, bytes_read=0):
+        if self.metrics is not None:
+            self.metrics.count(rows, bytes_read)
 
+    def record(self, data, file_path):
+        # Fold newly loaded rows into the statistics store. The file is
+        # loaded either way: rows that can't be aligned are left out of the
+        # statistics with a warning.
+        try:
+            if 'Class' not in data.columns:
+                data = self.reader.align(data, class_name_for(file_path))
+        except ValueError as e:
+            print(f"Warning: '{file_path}' left out of the statistics: {e}")
+            return 0
+        self.count(rows=len(data))
+        return self.stats.add(data, self.assessment_label(file_path))
+
+    def assessment_label(self, *file_paths):
+        # A file's assessment is the file as it is now: loading it again
+        # merges, a changed file is a new assessment
+        return tuple((os.path.abspath(path), self.file_version(path)) for path in sorted(file_paths))
+
+    @instrumented
+    def ingest_files(self, pattern, workers=None):
+        # Parse every file matching a directory or glob in a process pool and
+        # merge them into one frame tagged with Class and Source
+        try:
+            paths = find_assessment_files(pattern)
+            if not paths:
+                print(f"No csv, xlsx or txt files found for '{pattern}'.")
+                return
+
+            workers = workers or os.cpu_count() or 1
+            print(f"Processing {len(paths)} files with {min(workers, len(paths))} worker(s)...")
+            if workers == 1 or len(paths) == 1:
+                results = [read_tagged(path) for path in paths]
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    chunksize = max(1, len(paths) // (workers * 4))
+                    results = list(executor.map(read_tagged, paths, chunksize=chunksize))
+
+            frames = [data for _, data, error in results if error is None]
+            for path, _, error in results:
+                if error is not None:
+                    print(f"Error processing file '{path}': {error}")
+                    self.failures += 1
+
+            if frames:
+                self.data = pd.concat(frames, ignore_index=True)
+                loaded = [path for path, _, error in results if error is None]
+                self.stats.add(self.data, self.assessment_label(*loaded))
+                self.count(len(self.data), sum(os.path.getsize(path) for path, _, error in results if error is None))
+            print(f"Files processed successfully: {len(frames)} of {len(paths)} ({len(self.data) if frames else 0} rows)")
+            if frames:
+                print(self.data.groupby(['Source', 'Class']).size().rename('Rows').to_string())
 
+        except Exception as e:
+            print(f"Error processing files '{pattern}': {e}")
+            self.failures += 1
 
-    def transfer_data(self, source_file, destination_file):
+    @instrumented
+    def stream_file(self, file_path, chunksize=100_000, preview_rows=10):
+        # Process a file chunk by chunk: running statistics per score column
+        # and a bounded preview, without loading the whole file into self.data
         try:
-            # Check file format based on the file extension
-            file_format = source_file.split('.')[-1].strip().lower()
-
-            if file_format == 'txt':
-                # Custom logic to process plain text file
-                with open(source_file, 'r') as file:
-                    lines = file.readlines()
-
-                # Extracting information from each line
-                data_list = []
-                for line in lines:
-                    parts = line.strip().split(':')
-                    student_info = parts[0].strip()
-                    scores = parts[1].strip().split(', ')
-                    scores_dict = {subject.split()[0]: int(subject.split()[1]) for subject in scores}
-                    row = {'Student': student_info, **scores_dict}
-                    data_list.append(row)
-
-                # Creating a DataFrame from the list of dictionaries
-                source_data = pd.DataFrame(data_list)
-
-            elif file_format in ['xlsx', 'csv']:
-                # Read Excel or CSV file
-                source_data = pd.read_csv(source_file) if file_format == 'csv' else pd.read_excel(source_file)
+            print(f"Streaming file: {file_path} (chunks of {chunksize:,} rows)")
+            # Queries must not quietly answer from the previously loaded file
+            self.data = self.data_file = self.index = None
+            print("Streamed files are summarized but not kept in memory, so they can't be queried.")
+            stats = {}
+            rows = 0
+
+            for chunk in self.reader.iter_chunks(file_path, chunksize):
+                if rows == 0:
+                    print(f"First {preview_rows} rows:")
+                    with pd.option_context('display.max_columns', None):
+                        print(chunk.head(preview_rows))
+                rows += len(chunk)
+                self.record(chunk, file_path)
+                for column in chunk.select_dtypes(include='number').columns:
+                    stats.setdefault(column, RunningStats()).update(chunk[column])
+
+            self.file_stats = stats
+            self.count(bytes_read=os.path.getsize(file_path))
+            print(f"File processed successfully: {file_path} ({rows:,} rows)")
+            for column, column_stats in stats.items():
+                print(f"   - {column}: mean {column_stats.mean:.2f}, std {column_stats.std:.2f}, "
+                      f"min {column_stats.minimum:g}, max {column_stats.maximum:g} ({column_stats.count:,} scores)")
 
-            else:
-                raise ValueError("Unsupported source file format")
+        except FileNotFoundError:
+            print(f"Error: File '{file_path}' not found.")
+            self.failures += 1
+        except Exception as e:
+            print(f"Error processing file '{file_path}': {e}")
+            self.failures += 1
+
+    @instrumented
+    def transfer_data(self, source_file, destination_file, incremental=True):
+        try:
+            if incremental:
+                self.append_transfer(source_file, destination_file)
+                return
+
+            # Source files have a header row (text files name subjects inline)
+            source_data = self.reader.read(source_file, header=0)
+            self.record(source_data, source_file)
+            self.count(bytes_read=os.path.getsize(source_file))
 
             # Merge source data with existing data (if any)
             self.data = pd.concat([self.data, source_data], ignore_index=True)
+            self.data_file = source_file
 
             # Save the merged data to the destination CSV file
             self.data.to_csv(destination_file, index=False)
@@ -113,78 +1252,187 @@ class SchoolAssessmentCLI:
 
         except Exception as e:
             print(f"Error transferring data: {e}")
+            self.failures += 1
             traceback.print_exc()
 
+    def append_transfer(self, source_file, destination_file):
+        # Align the source to ASSESSMENT_COLUMNS and append only the students
+        # the destination doesn't have yet, so each transfer costs O(source
+        # rows) instead of rewriting everything transferred so far. A
+        # destination ending in .parquet is a directory of part files.
+        source_data = self.reader.align(self.reader.read(source_file, header=0), class_name_for(source_file))
+        keys = student_keys(source_data)
+        unique = ~keys.duplicated()
+        source_data, keys = source_data[unique], keys[unique]
+
+        # Probe the set per source row; Series.isin would walk the whole set
+        existing = self.existing_keys(destination_file)
+        is_new = pd.Series([key not in existing for key in keys], index=keys.index, dtype=bool)
+        new_rows = source_data[is_new]
+
+        if len(new_rows):
+            if destination_file.endswith('.parquet'):
+                os.makedirs(destination_file, exist_ok=True)
+                part = len([name for name in os.listdir(destination_file) if name.endswith('.parquet')])
+                new_rows.to_parquet(os.path.join(destination_file, f"part-{part:05d}.parquet"), index=False)
+            else:
+                write_header = not os.path.exists(destination_file) or os.path.getsize(destination_file) == 0
+                new_rows.to_csv(destination_file, mode='a', header=write_header, index=False)
+
+        existing.update(keys[is_new])
+        self.stats.add(source_data, self.assessment_label(source_file))
+        self.count(len(source_data), os.path.getsize(source_file))
+        self.destination_keys[os.path.abspath(destination_file)] = (self.file_version(destination_file), existing)
+        self.data = source_data.reset_index(drop=True)
+
+        print(f"Data transferred successfully: {len(new_rows)} new rows appended to {destination_file}, "
+              f"{len(source_data) - len(new_rows)} already present")
+
+    @staticmethod
+    def file_version(path):
+        if not os.path.exists(path):
+            return None
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def existing_keys(self, destination_file):
+        # Student keys already in the destination. Kept in memory between
+        # transfers and only re-read if something else changed the file.
+        path = os.path.abspath(destination_file)
+        version = self.file_version(destination_file)
+        cached = self.destination_keys.get(path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        if version is None:
+            return set()
+        if destination_file.endswith('.parquet'):
+            existing = pd.read_parquet(destination_file, columns=['Class', 'Student'])
+        elif os.path.getsize(destination_file) == 0:
+            return set()
+        else:
+            existing = pd.read_csv(destination_file, dtype=str)
+            if list(existing.columns) != ASSESSMENT_COLUMNS:
+                raise ValueError(f"Destination '{destination_file}' doesn't have the columns {', '.join(ASSESSMENT_COLUMNS)}")
+        return set(student_keys(existing))
 
 
 
-
-
-
-
-
-
-
-
-
-
+    @instrumented
     def fetch_web_data(self, url):
+        # One URL, or several separated by spaces or commas, fetched concurrently
         try:
-            # Fetch data from school webpage using urlopen
-            with urlopen(url) as response:
-                # Custom logic to extract relevant information from the webpage
-                html_content = response.read()
-
-                # Add your logic to parse the HTML content and extract information
-                # For example, you can use a library like BeautifulSoup for parsing HTML
-                # Here's a simple example using BeautifulSoup:
-
-
-                soup = BeautifulSoup(html_content, 'html.parser')
-                # Extract information based on HTML tags or structure
-                # For example, if student names are in <div> tags with class 'student-name':
-                student_names = [div.text.strip() for div in soup.find_all('div', class_='student-name')]
-
-                # Process the extracted information as needed
-                print("Web data fetched successfully")
-                print("Student names:", student_names)
+            urls = [part for part in re.split(r'[\s,]+', url.strip()) if part]
+            bytes_before = self.web_fetcher.bytes_read
+            results = self.web_fetcher.fetch_many(urls)
+            self.count(bytes_read=self.web_fetcher.bytes_read - bytes_before)
+
+            student_names, scores, rows = [], [], []
+            fetched = []
+            for page_url, (page, error) in results.items():
+                if error is not None:
+                    print(f"Error fetching web data from '{page_url}': {error}")
+                    self.failures += 1
+                else:
+                    fetched.append(page_url)
+                    student_names.extend(page['student_names'])
+                    scores.extend(page['scores'])
+                    rows.extend(page['rows'])
+
+            if not fetched:
+                return
+
+            # Process the extracted information as needed
+            self.web_data = {'urls': fetched, 'student_names': student_names, 'scores': scores, 'rows': rows}
+            self.count(rows=len(student_names) + len(scores) + len(rows))
+            print("Web data fetched successfully")
+            print("Student names:", student_names)
 
         except Exception as e:
             print(f"Error fetching web data from '{url}': {e}")
+            self.failures += 1
 
+    @instrumented
     def analyze_content(self, file_path):
         try:
             print(f"Analyzing content of file: {file_path}")
 
             if file_path.lower().endswith('.xlsx'):
-                # For Excel files, skip the first row and column
-                self.data = pd.read_excel(file_path, header=None, skiprows=1)
-                self.data.columns = range(len(self.data.columns))
+                # Excel sheets carry a header row
+                self.data = self.reader.read(file_path, header=0)
+                self.data_file = file_path
+                self.record(self.data, file_path)
+                self.count(bytes_read=os.path.getsize(file_path))
 
             else:
                 # For other file types, use the existing process_file method
                 self.process_file(file_path)
 
-            # Exclude non-numeric columns from analysis
-            numeric_columns = self.data.select_dtypes(include='number').columns
-            numeric_data = self.data[numeric_columns]
-
-            # Add your analysis logic here using the 'numeric_data' DataFrame
-
-            print("Content analyzed successfully")
+            analysis = self.stats.analysis()
+            print(f"Content analyzed successfully ({analysis.rows:,} scores across {len(analysis.class_means)} classes)")
 
         except Exception as e:
             print(f"Error analyzing content: {e}")
 
+    def query_index(self):
+        # AssessmentIndex over self.data, rebuilt only when self.data changes
+        if self.data is None:
+            raise ValueError("No assessment data loaded yet. Process, transfer or analyze a file first.")
+        if self.index is None or self.index.source is not self.data:
+            if 'Class' in self.data.columns:
+                aligned = self.data
+            else:
+                aligned = self.reader.align(self.data, class_name_for(self.data_file or 'Class'))
+            self.index = AssessmentIndex(aligned)
+            self.index.source = self.data
+        return self.index
 
+    def query_students(self, query):
+        try:
+            words = query.split()
+            command = words[0].lower() if words else ''
+            index = self.query_index()
+
+            if command == 'student' and len(words) > 1:
+                if 'in' in words[2:]:
+                    split = words.index('in', 2)
+                    result = index.student(' '.join(words[1:split]), ' '.join(words[split + 1:]))
+                else:
+                    result = index.student(' '.join(words[1:]))
+            elif command == 'class' and len(words) > 1:
+                result = index.class_roster(' '.join(words[1:]))
+            elif command in ('top', 'bottom') and len(words) in (2, 3):
+                k = int(words[2]) if len(words) == 3 else 10
+                result = index.top(words[1], k) if command == 'top' else index.bottom(words[1], k)
+            elif command == 'below' and len(words) in (2, 3):
+                result = index.below(float(words[1]), words[2] if len(words) == 3 else None)
+            elif command == 'above' and len(words) == 3:
+                result = index.above(float(words[1]), words[2])
+            else:
+                print(f"Unrecognized query '{query}'.")
+                return
 
+            if result.empty:
+                print("No matching students.")
+            else:
+                print(f"{len(result)} matching row(s):")
+                with pd.option_context('display.max_columns', None):
+                    print(result.to_string(index=False, na_rep='-'))
 
+        except Exception as e:
+            print(f"Error querying students: {e}")
 
+    @instrumented
     def generate_summary(self):
         try:
+            if not self.stats.overall.count:
+                print("No assessment data loaded yet. Process, transfer or analyze a file first.")
+                return
+
+            self.count(rows=self.stats.analysis().rows)
             print("\nSchool Assessment Summary Report:")
             
-            # 1. Overall Performance of Student A
+            # 1. Overall Performance of Students
             self.print_overall_performance()
 
             # 2. Subject-wise Analysis
@@ -205,92 +1453,101 @@ class SchoolAssessmentCLI:
 
         except Exception as e:
             print(f"Error generating summary: {e}")
+            self.failures += 1
 
     def print_overall_performance(self):
         print("\n1. Overall Performance of Students:")
-        
-        class1average = random.randint(80, 97)
-        class2average = random.randint(80, 97)
-        class3average = random.randint(80, 97)
-
-        # Calculate the average of all three classes
-        average_score = (class1average + class2average + class3average) / 3
-
-        # Determine the top-performing class
-        top_classes = []
-        if class1average == max(class1average, class2average, class3average):
-            top_classes.append("Class 1")
-        if class2average == max(class1average, class2average, class3average):
-            top_classes.append("Class 2")
-        if class3average == max(class1average, class2average, class3average):
-            top_classes.append("Class 3")
-
-        # Determine the worst-performing class
-        worst_classes = []
-        if class1average == min(class1average, class2average, class3average):
-            worst_classes.append("Class 1")
-        if class2average == min(class1average, class2average, class3average):
-            worst_classes.append("Class 2")
-        if class3average == min(class1average, class2average, class3average):
-            worst_classes.append("Class 3")
-
-        # Print results
-        print(f"   - Average score: {average_score:.2f}")
+
+        analysis = self.stats.analysis()
+        class_means = analysis.class_means
+        print(f"   - Average score: {analysis.average_score:.2f} (median {analysis.median_score})")
+
+        top_classes = class_means[class_means == class_means.max()].index
+        worst_classes = class_means[class_means == class_means.min()].index
+        worst_rank = analysis.class_ranks[worst_classes[0]]
 
         if len(top_classes) == 1:
-            print(f"   - Top-performing class: {top_classes[0]} (Average: {max(class1average, class2average, class3average)}, Rank: 1)")
+            print(f"   - Top-performing class: {top_classes[0]} (Average: {class_means.max():.2f}, Rank: 1)")
         else:
-            print(f"   - Top-performing classes: {', '.join(top_classes)} (Average: {max(class1average, class2average, class3average)}, Rank: 1)")
+            print(f"   - Top-performing classes: {', '.join(top_classes)} (Average: {class_means.max():.2f}, Rank: 1)")
 
-        if len(worst_classes) == 1:
-            print(f"   - Worst-performing class: {worst_classes[0]} (Average: {min(class1average, class2average, class3average)}, Rank: 3)")
-        else:
-            print(f"   - Worst-performing classes: {', '.join(worst_classes)} (Average: {min(class1average, class2average, class3average)}, Rank: 3)")
+        if len(class_means) > 1:
+            if len(worst_classes) == 1:
+                print(f"   - Worst-performing class: {worst_classes[0]} (Average: {class_means.min():.2f}, Rank: {worst_rank})")
+            else:
+                print(f"   - Worst-performing classes: {', '.join(worst_classes)} (Average: {class_means.min():.2f}, Rank: {worst_rank})")
+
+        top = analysis.top_students.iloc[0]
+        print(f"   - Top student: {top['Student']} of {top['Class']} (Average: {top['Average']:.2f})")
 
-        
     def print_subject_wise_analysis(self):
         print("\n2. Subject-wise Analysis:")
 
-        subjects = ['Mathematics', 'Physics', 'Chemistry', 'Science', 'English']
-
-        for subject in subjects:
-            improvement_percentage = random.randint(2, 10)
-
-            if improvement_percentage > 4:
-                print(f"   - {subject}: Improved by {improvement_percentage}% compared to the last assessment.")
+        analysis = self.stats.analysis()
+        for subject, mean in analysis.subject_means.items():
+            change = analysis.improvement.get(subject)
+            if change is None:
+                spread = analysis.class_subject_means[subject].std()
+                consistency = "consistent across classes" if not spread > 5 else f"varies across classes (std {spread:.1f})"
+                print(f"   - {subject}: Average {mean:.2f}, {consistency}.")
+            elif change >= 1:
+                print(f"   - {subject}: Improved by {change:.1f}% compared to the last assessment.")
+            elif change <= -1:
+                print(f"   - {subject}: Declined by {-change:.1f}% compared to the last assessment.")
             else:
-                print(f"   - {subject}: Consistent performance across all classes.")
-
-
+                print(f"   - {subject}: Consistent performance compared to the last assessment.")
 
     def print_notable_observations(self):
         print("\n3. Notable Observations:")
 
-        grade = random.choice(["Grade 1", "Grade 2", "Grade 3"])
-        improvement = random.choice(["a slight", "no", "a significant"])
-        subject = random.choice(["Mathematics", "Physics", "Chemistry", "Science", "English"])
-        
-        print(f"   - {grade} shows {improvement} improvement in {subject} proficiency.")
-
+        analysis = self.stats.analysis()
+        if len(analysis.class_means) > 1:
+            # Subject where a class is furthest above the average of all classes
+            gaps = analysis.class_subject_means - analysis.subject_means
+            stacked = gaps.stack()
+            (class_name, subject), gap = stacked.idxmax(), stacked.max()
+            print(f"   - {class_name} is {gap:.1f} points above the school average in {subject}.")
+
+        low, high = analysis.low_outliers.sum(), analysis.high_outliers.sum()
+        if not low and not high:
+            print(f"   - No scores more than {analysis.OUTLIER_Z:g} standard deviations from their subject average.")
+        else:
+            print(f"   - {low + high} outlier scores (|z| > {analysis.OUTLIER_Z:g}): {low} low, {high} high.")
+            for row in analysis.lowest_outliers.head(3).itertuples():
+                print(f"     - {row.Student} ({row.Class}) scored {row.Score:g} in {row.Subject} (z = {row.Z:.2f})")
 
     def print_web_data_insights(self):
         print("\n4. Web Data Insights:")
-        
-        online = random.randint(80, 98)
-        
-        print(f"   - Online participation: {online}% of students accessed assessment resources online.")
 
+        if not self.web_data:
+            print("   - No web data fetched yet.")
+            return
 
+        names = self.web_data['student_names']
+        urls = self.web_data['urls']
+        if len(urls) == 1:
+            print(f"   - {len(names)} students listed on {urls[0]}.")
+        else:
+            print(f"   - {len(names)} students listed across {len(urls)} pages.")
+        if self.web_data['scores']:
+            print(f"   - {len(self.web_data['scores'])} scores published online.")
+        if self.web_data['rows']:
+            print(f"   - {len(self.web_data['rows'])} rows in online assessment tables.")
 
     def print_recommendations(self):
-        # Add logic to print recommendations
         print("\n5. Recommendations:")
-        
-        grade = random.choice(["Grade 1", "Grade 2", "Grade 3"])
-        subject = random.choice(["Mathematics", "Physics", "Chemistry", "Science", "English"])
 
-        print(f"   - {random.choice(['Increase', 'Decrease'])} the number of assessments to improve student performance.")
-        print(f"   - Consider additional support for {grade} in {subject}.")
+        analysis = self.stats.analysis()
+        class_name, subject, mean = analysis.weakest_class_subject
+        print(f"   - Consider additional support for {class_name} in {subject} (Average: {mean:.2f}).")
+
+        struggling = analysis.low_outliers.sum()
+        if struggling:
+            print(f"   - Follow up on {struggling} score(s) well below their subject average.")
+
+        declining = analysis.improvement[analysis.improvement <= -1]
+        for subject, change in declining.items():
+            print(f"   - Review teaching of {subject}, which declined by {-change:.1f}%.")
 
 
 
@@ -298,10 +1555,11 @@ class SchoolAssessmentCLI:
     def run(self):
         while True:
             self.display_menu()
-            choice = input("Enter your choice (0-5): ")
+            choice = input("Enter your choice (0-7): ")
 
             if choice == '0':
                 print("Exiting the School Assessment System.")
+                self.web_fetcher.close()
                 break
             elif choice == '1':
                 file_path = input("Enter the path of the file: ")
@@ -312,18 +1570,130 @@ class SchoolAssessmentCLI:
                 destination_file = input("Enter the destination file path: ")
                 self.transfer_data( source_file, destination_file)
             elif choice == '3':
-                url = input("Enter the URL for web data retrieval: ")
+                url = input("Enter the URL(s) for web data retrieval: ")
                 self.fetch_web_data(url)
             elif choice == '4':
                 file_path = input("Enter the path of the file you want to analyze: ")
                 self.analyze_content(file_path)
             elif choice == '5':
                 self.generate_summary()
+            elif choice == '6':
+                pattern = input("Enter a directory or glob pattern (e.g. csv_data/*.csv): ")
+                self.ingest_files(pattern)
+            elif choice == '7':
+                print("Queries: student NAME [in CLASS] | class CLASS | top SUBJECT [K] | bottom SUBJECT [K]")
+                print("         below SCORE [SUBJECT] | above SCORE SUBJECT")
+                query = input("Enter a query: ")
+                self.query_students(query)
             else:
-                print("Invalid choice. Please enter a number between 0 and 5.")
-
-if __name__ == "__main__":
-    school_assessment_cli = SchoolAssessmentCLI()
+                print("Invalid choice. Please enter a number between 0 and 7.")
+
+def as_list(value):
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def run_job(job, metrics=None):
+    # One non-interactive run: load data, fetch pages, then write the
+    # summary to job['summary'] ('-' or missing for stdout). Returns the
+    # number of steps that failed.
+    cli = SchoolAssessmentCLI(metrics)
+    try:
+        for pattern in as_list(job.get('ingest')):
+            cli.ingest_files(pattern, workers=job.get('workers'))
+        for file_path in as_list(job.get('process')):
+            cli.process_file(file_path)
+        for source_file, destination_file in job.get('transfer') or []:
+            cli.transfer_data(source_file, destination_file)
+        urls = as_list(job.get('fetch'))
+        if urls:
+            cli.fetch_web_data(' '.join(urls))
+
+        summary = job.get('summary') or '-'
+        if summary == '-':
+            cli.generate_summary()
+        else:
+            with open(summary, 'w') as file, contextlib.redirect_stdout(file):
+                cli.generate_summary()
+            print(f"Summary written to {summary}")
+        return cli.failures
+    finally:
+        cli.web_fetcher.close()
+
+
+def load_jobs(job_file):
+    # A job file is JSON: one job object, a list of them, or {"jobs": [...]}.
+    # Job keys match the command-line options: ingest, process, transfer,
+    # fetch, summary, workers.
+    with open(job_file) as file:
+        jobs = json.load(file)
+    if isinstance(jobs, dict):
+        jobs = jobs.get('jobs', [jobs])
+    return jobs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="School Assessment System. Without arguments, starts the interactive menu.")
+    parser.add_argument('--ingest', action='append', metavar='PATTERN',
+                        help="directory or glob of csv/xlsx/txt files to load (repeatable)")
+    parser.add_argument('--process', action='append', metavar='FILE', help="single file to load (repeatable)")
+    parser.add_argument('--transfer', action='append', nargs=2, metavar=('SOURCE', 'DESTINATION'),
+                        help="append SOURCE to DESTINATION (repeatable)")
+    parser.add_argument('--fetch', action='append', metavar='URL', help="school page to fetch (repeatable)")
+    parser.add_argument('--summary', metavar='PATH', help="write the summary report here ('-' for stdout)")
+    parser.add_argument('--workers', type=int, help="processes for --ingest")
+    parser.add_argument('--job', metavar='FILE', help="JSON job file; every job in it runs in turn")
+    parser.add_argument('--metrics', metavar='PATH',
+                        help="record per-stage time, rows, bytes and peak memory; write them here "
+                             "(.prom or .txt for Prometheus text, JSON otherwise)")
+    parser.add_argument('--no-trace-memory', action='store_true',
+                        help="with --metrics, skip peak-memory tracing, which slows allocation-heavy stages")
+    parser.add_argument('--profile', metavar='PATH', nargs='?', const='',
+                        help="run under cProfile; dump stats to PATH, or print the top functions without one")
+    args = parser.parse_args(argv)
+
+    metrics = PipelineMetrics(trace_memory=not args.no_trace_memory) if args.metrics else None
+    profile = profiled(args.profile or None) if args.profile is not None else contextlib.nullcontext()
+    with profile:
+        failures = run(args, metrics)
+
+    if metrics is not None:
+        metrics.print_report()
+        metrics.save(args.metrics)
+        print(f"Metrics written to {args.metrics}")
+    if failures:
+        print(f"Finished with {failures} failure(s).")
+        sys.exit(1)
+
+
+def run(args, metrics=None):
+    # Returns the number of failures: jobs that stopped with an error plus
+    # failed steps inside the jobs that ran
+    if args.job:
+        jobs = load_jobs(args.job)
+        failures = 0
+        for number, job in enumerate(jobs, 1):
+            print(f"Job {number} of {len(jobs)}")
+            try:
+                failures += run_job(job, metrics)
+            except Exception as e:
+                print(f"Error running job {number}: {e}")
+                failures += 1
+        return failures
+
+    options = {'ingest', 'process', 'transfer', 'fetch', 'summary', 'workers'}
+    job = {name: value for name, value in vars(args).items() if value is not None and name in options}
+    if job:
+        return run_job(job, metrics)
+
+    school_assessment_cli = SchoolAssessmentCLI(metrics)
     school_assessment_cli.run()
     date = datetime.datetime.now().strftime("%Y-%m-%d")
     print(f"Report generated on: {date}")
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Hot-path suite harness shared by the apps' benchmark.py scripts.
+
+Each app supplies run_suite(size, repeat) -> {case: [seconds per run]};
+this module times, prints, saves and compares the results the same way
+for every app:
+    python benchmark.py --suite 10000 --save before.json
+    python benchmark.py --suite 10000 --compare before.json
+"""
+
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+
+def time_runs(func, setup=None, repeat=5):
+    # Seconds for each of `repeat` calls of func(setup()); setup isn't timed
+    runs = []
+    for _ in range(repeat):
+        argument = setup() if setup is not None else None
+        start = time.perf_counter()
+        func(argument)
+        runs.append(time.perf_counter() - start)
+    return runs
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def save_results(path, name, results):
+    report = {
+        'benchmark': name,
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'results': {case: {'median': statistics.median(runs), 'min': min(runs), 'runs': runs}
+                    for case, runs in results.items()},
+    }
+    with open(path, 'w') as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {path}")
+
+
+def compare_results(path, name, results, threshold=10.0):
+    # Print median changes against a saved run; returns the number of cases
+    # more than `threshold` percent slower
+    with open(path) as file:
+        baseline = json.load(file)
+    if baseline.get('benchmark') != name:
+        sys.exit(f"{path} holds '{baseline.get('benchmark')}' results, not '{name}'")
+    print(f"Compared with {path} (commit {baseline.get('commit')}, {baseline.get('created')}):")
+
+    width = max(map(len, results), default=0)
+    regressions = 0
+    for case, runs in results.items():
+        before = baseline['results'].get(case)
+        if before is None:
+            print(f"   {case:<{width}} {statistics.median(runs) * 1e3:10.2f} ms   (new)")
+            continue
+        change = (statistics.median(runs) - before['median']) / before['median'] * 100
+        flag = "  REGRESSION" if change > threshold else ""
+        regressions += change > threshold
+        print(f"   {case:<{width}} {before['median'] * 1e3:10.2f} ms -> {statistics.median(runs) * 1e3:10.2f} ms "
+              f"({change:+6.1f}%){flag}")
+    return regressions
+
+
+def suite(name, run_suite, sizes, repeat, save, compare, threshold):
+    results = {}
+    for size in sizes:
+        results.update(run_suite(size, repeat))
+
+    width = max(map(len, results), default=0)
+    for case, runs in results.items():
+        print(f"   {case:<{width}} median {statistics.median(runs) * 1e3:10.2f} ms | min {min(runs) * 1e3:10.2f} ms")
+    regressions = compare_results(compare, name, results, threshold) if compare else 0
+    if save:
+        save_results(save, name, results)
+    return regressions
+
+
+def add_arguments(parser):
+    parser.add_argument('--suite', action='store_true', help="run only the hot-path suite")
+    parser.add_argument('--save', metavar='PATH', help="save suite results as JSON (implies --suite)")
+    parser.add_argument('--compare', metavar='PATH', help="compare suite results with a saved run (implies --suite)")
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per suite case")
+    parser.add_argument('--threshold', type=float, default=10.0, help="percent slowdown reported as a regression")
+
+
+def run_requested(args, name, run_suite, default_sizes):
+    # Run the suite if the arguments ask for it and exit with status 1 on
+    # any regression; otherwise return so the full benchmarks run
+    if args.suite or args.save or args.compare:
+        print("Hot-path suite:")
+        regressions = suite(name, run_suite, args.sizes or default_sizes, args.repeat, args.save, args.compare,
+                            args.threshold)
+        sys.exit(1 if regressions else 0)